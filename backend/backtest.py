@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+backtest.py
+
+Rolling-origin backtest of the served recursive forecasts.
+
+results.json scores one-step-ahead windows on a random 80/20 split, but
+the servers answer with `steps`-year recursive forecasts. This replays
+exactly what the servers do (same raw series, sqrt/square for tiny
+categories, clamping) from every historical origin: for origin year t
+the model sees the `window` years before t and forecasts t, t+1, ...,
+and each step is compared with the actual value where one exists.
+
+All categories and all origins advance together: one (categories ×
+origins × window) batch through the stacked forward pass per step
+(forecast_engine.forecast_scaled_paths), i.e. `steps` passes per domain
+instead of one predict call per category, origin and step.
+
+Metrics per horizon h = 1..steps (per category and over all categories):
+  mae, rmse, smape (%), n (forecasts that had an actual value)
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import forecast_engine as engine
+
+
+def scaled_history(m, values, categories):
+    """(categories × years) model inputs: sqrt for tiny categories, then scaled."""
+    inputs = values.copy()
+    for i, cat in enumerate(categories):
+        if cat in m["tiny_categories"]:
+            inputs[i] = np.sqrt(inputs[i])
+
+    scales = np.array([m["scalers"][c].scale_[0] for c in categories])[:, None]
+    mins = np.array([m["scalers"][c].min_[0] for c in categories])[:, None]
+    return inputs * scales + mins
+
+
+def horizon_metrics(preds, actual):
+    """Metrics over (..., origins, steps) arrays, reduced to one value per step."""
+    err = preds - actual
+    valid = np.isfinite(err)
+    n = valid.sum(axis=-2)
+    err = np.where(valid, err, 0.0)
+
+    denom = np.abs(actual) + np.abs(preds) + 1e-8
+    ratio = np.where(valid, 2 * np.abs(err) / np.where(valid, denom, 1.0), 0.0)
+
+    count = np.maximum(n, 1)
+    return {
+        "mae": (np.abs(err).sum(axis=-2) / count).tolist(),
+        "rmse": np.sqrt((err ** 2).sum(axis=-2) / count).tolist(),
+        "smape": (ratio.sum(axis=-2) / count * 100).tolist(),
+        "n": n.tolist()
+    }
+
+
+def backtest(m, series, last_year, steps=10):
+    """
+    Backtest every category of the model entry `m` on `series`
+    ({category: raw yearly values}, ending in `last_year`).
+    """
+    categories = m["categories"]
+    window = m["window"]
+
+    values = np.stack([np.asarray(series[c], dtype=np.float64) for c in categories])
+    n_years = values.shape[1]
+    n_origins = n_years - window
+    if n_origins < 1:
+        raise ValueError(f"{n_years} years are too few for window={window}")
+    steps = min(steps, n_origins)
+
+    # start windows of every origin: (categories, origins, window)
+    windows = sliding_window_view(scaled_history(m, values, categories)[:, :-1], window, axis=1)
+
+    scaled = engine.forecast_scaled_paths([m["models"][c] for c in categories],
+                                          windows, steps)
+    square = [c in m["tiny_categories"] for c in categories]
+    preds = engine.to_values(scaled, [m["scalers"][c] for c in categories],
+                             m["clamp"], square)
+
+    # actual[c, o, h] = value h years after origin o (NaN past the data)
+    padded = np.concatenate([values, np.full((len(categories), steps), np.nan)], axis=1)
+    actual = sliding_window_view(padded[:, window:], steps, axis=1)[:, :n_origins]
+
+    first_origin = last_year - n_years + 1 + window
+    overall = horizon_metrics(preds.reshape(1, -1, steps), actual.reshape(1, -1, steps))
+    per_category = horizon_metrics(preds, actual)
+
+    return {
+        "domain": m["domain"],
+        "model_used": m["name"],
+        "window": window,
+        "steps": steps,
+        "origins": {"count": n_origins, "first": first_origin, "last": last_year},
+        "horizons": list(range(1, steps + 1)),
+        "overall": {k: v[0] for k, v in overall.items()},
+        "categories": {
+            cat: {k: v[i] for k, v in per_category.items()}
+            for i, cat in enumerate(categories)
+        }
+    }
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+bench_startup.py
+
+Reproducible start-up benchmark for the prediction servers.
+
+For every server module a fresh interpreter is spawned and timed from
+spawn to the first successful forecast request (Flask test client, no
+network). Each child runs with -X importtime and reports where its time
+went:
+ - import cost of numpy / flask / flask_cors / pandas / sklearn / scipy
+ - unpickling (.pkl packs) and memory-mapping (.bin packs)
+ - importing the server module and serving the first request
+
+Usage:
+  python bench_startup.py                      # every server, 5 runs each
+  python bench_startup.py --runs 10 server     # one server
+  python bench_startup.py --json               # raw per-run numbers
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SERVERS = {
+    "server": "/predict?gender=male",
+    "predict_api": "/predict?gender=male",
+    "age_predictor_server": "/predict?group=15_19",
+    "education_predictor": "/predict-education?category=college",
+    "emigrants_predict_server": "/predict?status=single"
+}
+
+TRACKED_IMPORTS = ["numpy", "flask", "flask_cors", "pandas", "sklearn", "scipy"]
+
+# ============================================================
+# CHILD: runs inside the freshly spawned interpreter
+# ============================================================
+
+def run_child(module, url):
+    start = time.perf_counter()
+    sys.path.insert(0, BASE_DIR)
+
+    import pickle
+    try:
+        import model_artifacts
+    except ImportError:  # older trees without memory-mapped packs
+        model_artifacts = None
+
+    timings = {"unpickle_ms": 0.0, "mmap_load_ms": 0.0}
+
+    def timed(fn, field):
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timings[field] += (time.perf_counter() - t0) * 1000
+        return wrapper
+
+    pickle.load = timed(pickle.load, "unpickle_ms")
+    if model_artifacts is not None:
+        model_artifacts.load_artifact = timed(model_artifacts.load_artifact, "mmap_load_ms")
+
+    t0 = time.perf_counter()
+    mod = __import__(module)
+    timings["import_module_ms"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    resp = mod.app.test_client().get(url)
+    timings["first_request_ms"] = (time.perf_counter() - t0) * 1000
+
+    if resp.status_code != 200:
+        raise SystemExit(f"{module} {url} -> HTTP {resp.status_code}")
+
+    timings["child_total_ms"] = (time.perf_counter() - start) * 1000
+    timings["loaded"] = [m for m in TRACKED_IMPORTS if m in sys.modules]
+
+    try:
+        import resource
+        timings["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        pass
+
+    print("BENCH " + json.dumps(timings))
+
+
+def parse_importtime(stderr):
+    """Cumulative import time (ms) of each tracked top-level package."""
+    costs = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].strip()
+        if name in TRACKED_IMPORTS and name not in costs:
+            costs[name] = int(parts[1]) / 1000
+    return costs
+
+# ============================================================
+# PARENT
+# ============================================================
+
+def run_once(module, url):
+    cmd = [sys.executable, "-X", "importtime", os.path.abspath(__file__),
+           "--child", module, url]
+
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=BASE_DIR, capture_output=True, text=True)
+    wall = (time.perf_counter() - t0) * 1000
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} failed:\n{proc.stdout}\n{proc.stderr[-2000:]}")
+
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("BENCH "))
+    result = json.loads(line[len("BENCH "):])
+    result["spawn_to_first_predict_ms"] = wall
+    result["imports_ms"] = parse_importtime(proc.stderr)
+    return result
+
+
+def summarize(module, runs):
+    med = lambda key: statistics.median(r[key] for r in runs)
+    imports = {
+        name: statistics.median(r["imports_ms"].get(name, 0.0) for r in runs)
+        for name in TRACKED_IMPORTS
+    }
+
+    print(f"\n{module}  ({len(runs)} runs, medians)")
+    print(f"  spawn → first /predict : {med('spawn_to_first_predict_ms'):8.1f} ms")
+    print(f"  import server module   : {med('import_module_ms'):8.1f} ms")
+    print(f"  first request          : {med('first_request_ms'):8.1f} ms")
+    print(f"  unpickle               : {med('unpickle_ms'):8.1f} ms")
+    print(f"  mmap load              : {med('mmap_load_ms'):8.1f} ms")
+    for name, ms in imports.items():
+        if ms:
+            print(f"  import {name:<16}: {ms:8.1f} ms")
+    if "max_rss_kb" in runs[0]:
+        print(f"  max RSS                : {med('max_rss_kb') / 1024:8.1f} MB")
+    print(f"  modules loaded         : {', '.join(runs[-1]['loaded'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("servers", nargs="*", help="server modules (default: all)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    parser.add_argument("--child", nargs=2, metavar=("MODULE", "URL"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    modules = args.servers or list(SERVERS)
+    results = {}
+    for module in modules:
+        results[module] = [run_once(module, SERVERS[module]) for _ in range(args.runs)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for module, runs in results.items():
+        summarize(module, runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+bench_throughput.py
+
+Throughput benchmark for the production runner (serve.py).
+
+For each worker count, serve.py is started on a free port and hammered by
+a pool of client processes cycling through the existing endpoints for a
+fixed duration. Reported per worker count: requests/s, p50 / p99 latency
+and the speed-up over one worker.
+
+Usage:
+  python bench_throughput.py                       # workers 1,2,4,8 (<= cores)
+  python bench_throughput.py --workers 1,2,4 --duration 10 --clients 16
+  python bench_throughput.py --json
+
+Throughput scales with the number of physical cores as long as there are
+at least as many clients as workers; past the core count the extra
+workers only add context switches. Forecasts are served from each
+worker's forecast cache after the first request, so the numbers measure
+the request path (routing, cache lookup, JSON encoding) that dominates
+in production.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+URLS = [
+    "/predict?gender=male",
+    "/predict?group=15_19",
+    "/predict?status=single",
+    "/predict-all",
+    "/predict-education?category=college",
+    "/predict-education-all",
+    "/civil-predict-all",
+    "/results?age"
+]
+
+# ============================================================
+# CLIENTS
+# ============================================================
+
+def client_loop(port, deadline, queue):
+    latencies = []
+    errors = 0
+    i = os.getpid()
+    while time.perf_counter() < deadline:
+        url = URLS[i % len(URLS)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            conn.request("GET", url)
+            resp = conn.getresponse()
+            resp.read()
+            conn.close()
+            if resp.status != 200:
+                errors += 1
+                continue
+        except OSError:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - t0) * 1000)
+    queue.put((latencies, errors))
+
+
+def drive(port, clients, duration):
+    queue = multiprocessing.Queue()
+    deadline = time.perf_counter() + duration
+    procs = [multiprocessing.Process(target=client_loop, args=(port, deadline, queue))
+             for _ in range(clients)]
+    for p in procs:
+        p.start()
+
+    latencies, errors = [], 0
+    for _ in procs:
+        lat, err = queue.get()
+        latencies.extend(lat)
+        errors += err
+    for p in procs:
+        p.join()
+    return latencies, errors
+
+# ============================================================
+# SERVER
+# ============================================================
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/ready")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"serve.py on port {port} never became ready")
+
+
+def run_once(workers, clients, duration):
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port)],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_ready(port)
+        drive(port, clients, 1.0)  # fill every worker's forecast cache
+        latencies, errors = drive(port, clients, duration)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    latencies.sort()
+    return {
+        "workers": workers,
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) if latencies else None,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] if latencies else None
+    }
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = ",".join(str(n) for n in [1, 2, 4, 8] if n <= cores) or "1"
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default=default_workers,
+                        help="comma separated worker counts")
+    parser.add_argument("--clients", type=int, default=None,
+                        help="concurrent clients (default: 2 x largest worker count)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.workers.split(",")]
+    clients = args.clients or 2 * max(counts)
+
+    results = [run_once(n, clients, args.duration) for n in counts]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{cores} core(s), {clients} clients, {args.duration:.0f} s per run")
+    print(f"{'workers':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'speed-up':>9} {'errors':>7}")
+    base = results[0]["rps"] or 1
+    for r in results:
+        print(f"{r['workers']:>8} {r['rps']:>9.0f} {r['p50_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {r['rps'] / base:>8.2f}x {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
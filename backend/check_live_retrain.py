@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+check_live_retrain.py
+
+End-to-end check that retraining under a running server neither crashes
+it nor drops requests.
+
+In a scratch copy of backend/ (the real packs are never touched) it
+starts `serve.py` with a short MODEL_WATCH_INTERVAL, keeps requesting
+forecasts of the retrained domains from several threads, and meanwhile
+runs train.py --full on the same model directories, so every mlpN .pkl,
+.bin and manifest is rewritten while the server has them mapped. It
+fails when:
+ - the server or one of its workers dies (e.g. SIGBUS on a mapped pack)
+ - any forecast request does not return 200
+ - the watcher did not pick up the retrained packs
+
+Usage:
+  python check_live_retrain.py                     # civil, 2 rounds
+  python check_live_retrain.py --domains age,civil --rounds 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ROUTES = {
+    "gender": "/predict?gender=male",
+    "age": "/predict-all",
+    "education": "/predict-education-all",
+    "civil": "/civil-predict-all"
+}
+
+
+def get(port, path, timeout=10):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=timeout) as r:
+            return r.status, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+    except OSError as e:
+        return None, str(e).encode()
+
+
+def wait_ready(port, proc, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited during start-up ({proc.returncode})")
+        if get(port, "/ready", timeout=2)[0] == 200:
+            return
+        time.sleep(0.2)
+    raise SystemExit("server did not become ready")
+
+
+def hammer(port, paths, stop, failures, counts):
+    while not stop.is_set():
+        for path in paths:
+            status, body = get(port, path)
+            counts[0] += 1
+            if status != 200:
+                failures.append((path, status, body[:200]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domains", default="civil")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--port", type=int, default=5191)
+    args = parser.parse_args()
+    domains = [d for d in args.domains.split(",") if d]
+
+    scratch = tempfile.mkdtemp(prefix="live-retrain-")
+    workdir = os.path.join(scratch, "backend")
+    shutil.copytree(BASE_DIR, workdir, ignore=shutil.ignore_patterns("__pycache__"))
+
+    env = dict(os.environ, MODEL_WATCH_INTERVAL="0.5", SERVE_DOMAINS=",".join(domains))
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", "2", "--port", str(args.port)],
+        cwd=workdir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    log = []
+    threading.Thread(target=lambda: log.extend(server.stdout), daemon=True).start()
+
+    stop, failures, counts = threading.Event(), [], [0]
+    try:
+        wait_ready(args.port, server)
+        paths = [ROUTES[d] for d in domains]
+        threads = [threading.Thread(target=hammer, args=(args.port, paths, stop, failures, counts))
+                   for _ in range(args.threads)]
+        for t in threads:
+            t.start()
+
+        for i in range(args.rounds):
+            start = time.perf_counter()
+            train = subprocess.run(
+                [sys.executable, "train.py", "--domains", ",".join(domains), "--full"],
+                cwd=workdir, capture_output=True, text=True
+            )
+            if train.returncode != 0:
+                raise SystemExit(f"train.py failed:\n{train.stderr[-2000:]}")
+            print(f"🔁 round {i + 1}: retrained {','.join(domains)} "
+                  f"in {time.perf_counter() - start:.1f} s")
+            time.sleep(2)  # let both workers' watchers settle and swap
+
+        stop.set()
+        for t in threads:
+            t.join()
+
+        alive = server.poll() is None
+        status, body = get(args.port, "/reload")
+        reloads = json.loads(body)["reloads"] if status == 200 else 0
+    finally:
+        stop.set()
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    restarts = [line.strip() for line in log if "exited" in line]
+    print(f"  requests: {counts[0]}, failed: {len(failures)}, "
+          f"reloads (one worker): {reloads}, worker restarts: {len(restarts)}")
+
+    problems = []
+    if not alive:
+        problems.append(f"server died ({server.returncode})")
+    if restarts:
+        problems.append("workers died: " + "; ".join(restarts))
+    if failures:
+        problems.append(f"{len(failures)} failed requests, first: {failures[0]}")
+    if reloads < 1:
+        problems.append("no hot reload happened")
+
+    if problems:
+        raise SystemExit("❌ " + "\n❌ ".join(problems))
+    print("✅ retraining under a live server: no crash, no failed request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+dataset_store.py
+
+In-memory registry for the yearly CSV datasets.
+
+Each CSV is parsed once into read-only NumPy arrays keyed by column name.
+Every lookup does a cheap os.stat(); when the file's inode, mtime or size
+changes (e.g. a new year is published) the CSV is parsed again and the new
+snapshot replaces the old one in a single reference swap, so requests
+never see a half-loaded dataset.
+
+Paths are resolved relative to this directory, not the working directory.
+"""
+
+import csv
+import os
+import threading
+
+import numpy as np
+
+from forecast_cache import file_fingerprint
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def data_path(filename):
+    return os.path.join(BASE_DIR, filename)
+
+# ============================================================
+# CSV → COLUMN ARRAYS
+# ============================================================
+
+def _to_column(raw):
+    """float64 array if every cell is numeric (blank → NaN), else str array."""
+    try:
+        col = np.array([float(v) if v.strip() else np.nan for v in raw],
+                       dtype=np.float64)
+    except ValueError:
+        col = np.array(raw, dtype=str)
+    col.flags.writeable = False
+    return col
+
+
+def parse_csv(path):
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    header, body = rows[0], [r for r in rows[1:] if r]
+    return {
+        name: _to_column([r[i] for r in body])
+        for i, name in enumerate(header)
+    }
+
+
+def load_snapshot(path, derive=None):
+    """
+    Parse a CSV into an immutable snapshot dict. `derive`, if given, builds
+    an extra lookup structure ("index") from the columns in the same step.
+    """
+    fingerprint = file_fingerprint(path)
+    columns = parse_csv(path)
+    return {
+        "path": path,
+        "fingerprint": fingerprint,
+        "columns": columns,
+        "index": derive(columns) if derive else None
+    }
+
+# ============================================================
+# REGISTRY
+# ============================================================
+
+class DatasetStore:
+
+    def __init__(self):
+        self._paths = {}
+        self._derive = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, filename, derive=None):
+        path = data_path(filename)
+        self._paths[name] = path
+        self._derive[name] = derive
+        self._snapshots[name] = load_snapshot(path, derive)
+
+    def path(self, name):
+        return self._paths[name]
+
+    def get(self, name):
+        """Current snapshot of a dataset, reloaded if the file changed."""
+        snap = self._snapshots[name]
+        if file_fingerprint(snap["path"]) != snap["fingerprint"]:
+            with self._lock:
+                snap = self._snapshots[name]
+                if file_fingerprint(snap["path"]) != snap["fingerprint"]:
+                    snap = load_snapshot(snap["path"], self._derive[name])
+                    self._snapshots[name] = snap
+        return snap
+
+    def column(self, name, column):
+        return self.get(name)["columns"][column]
+
+    def index(self, name):
+        return self.get(name)["index"]
+
+    def fingerprint(self, name):
+        return self.get(name)["fingerprint"]
+
+# ============================================================
+# LONG-FORMAT AGE DATA
+# ============================================================
+
+def to_snake(s):
+    """Age group label → snake_case key (same as the training script)."""
+    return (
+        s.replace(" - ", "_")
+         .replace("-", "_")
+         .replace(" ", "_")
+         .lower()
+    )
+
+
+def build_age_index(cols):
+    """
+    Pivot age_yearly.csv to one contiguous float64 series per age group.
+
+    Mirrors train_age_mlp_sklearn.py: pivot on year (sorted), linear
+    interpolation over row positions, then bfill/ffill at the edges.
+    """
+    years = np.unique(cols["year"])
+    keys = np.array([to_snake(g) for g in cols["ageGroup"]])
+    groups = sorted(set(keys.tolist()))
+
+    row = np.searchsorted(years, cols["year"])
+    positions = np.arange(len(years), dtype=np.float64)
+
+    index = {}
+    for g in groups:
+        mask = keys == g
+        series = np.full(len(years), np.nan)
+        series[row[mask]] = cols["count"][mask]
+
+        valid = ~np.isnan(series)
+        if not valid.all():
+            series = np.interp(positions, positions[valid], series[valid])
+
+        series.flags.writeable = False
+        index[g] = series
+
+    years.flags.writeable = False
+    return {"years": years, "groups": index}
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+domain_registry.py
+
+Declarative registry of the forecast domains (one per dashboard).
+
+Each domain declares what the serving code needs to forecast it:
+  directory     model pack directory (best_model.json, mlpN packs, results.json),
+                relative to backend/ like the dataset and stored absolute, so
+                the servers work from any working directory
+  dataset       yearly CSV (relative to backend/), parsed by dataset_store,
+                and `derive`, an optional index built from its columns
+  series        snapshot -> (last year, {category: raw yearly values}):
+                maps the CSV onto the pack's categories
+  clamp         clamp forecasts to >= 0
+  tiny_default  categories modelled in sqrt space (squared back on the way
+                out) when the pack does not list its own tiny_categories
+  legacy        the standalone server the domain used to run as: script,
+                port, the paths of its results routes and the
+                "Why this model was selected" text its bodies carried
+
+model_registry, server.py and serve.py read everything from here: the
+packs, datasets and results documents of all domains are loaded once,
+in one process, and the legacy routes are served from that shared state
+(see LEGACY SERVERS in server.py). A new dashboard is one
+register_domain() call plus its trained pack.
+"""
+
+from dataset_store import build_age_index, data_path
+
+DOMAINS = {}
+
+# ============================================================
+# CATEGORY SERIES
+# ============================================================
+
+def column_series(snapshot):
+    """Wide CSV: one column per category next to `year`."""
+    cols = snapshot["columns"]
+    return int(cols["year"].max()), cols
+
+
+def age_series(snapshot):
+    """Long-format age CSV, pivoted by build_age_index."""
+    index = snapshot["index"]
+    return int(index["years"][-1]), index["groups"]
+
+# ============================================================
+# REGISTRATION
+# ============================================================
+
+def register_domain(name, directory, dataset, series=column_series, derive=None,
+                    clamp=False, tiny_default=None, legacy=None):
+    DOMAINS[name] = {
+        "directory": data_path(directory),
+        "dataset": dataset,
+        "derive": derive,
+        "series": series,
+        "clamp": clamp,
+        "tiny_default": list(tiny_default or []),
+        "legacy": legacy
+    }
+    return DOMAINS[name]
+
+
+def legacy_domains():
+    return [d for d, spec in DOMAINS.items() if spec["legacy"]]
+
+
+def explanation(*points):
+    return {"title": "Why this model was selected", "points": list(points)}
+
+# ============================================================
+# DOMAINS
+# ============================================================
+
+register_domain(
+    "gender", "public/models", "gender_yearly.csv",
+    legacy={
+        "script": "predict_api.py", "port": 5000,
+        "best_model_route": "/best-model", "results_route": "/results",
+        "explanation": explanation(
+            "It achieved the highest validation accuracy among all trained MLP architectures.",
+            "It produced the lowest MAE, RMSE, and MAPE values during testing.",
+            "It demonstrated the most stable 10-year forecasting behavior.",
+            "It avoided overfitting and generalized best across male/female patterns.",
+            "It performed consistently on both male and female historical data."
+        )
+    }
+)
+
+register_domain(
+    "age", "public/models_age", "age_yearly.csv",
+    series=age_series, derive=build_age_index,
+    legacy={
+        # was 5001, which the unified server owns
+        "script": "age_predictor_server.py", "port": 5002,
+        "best_model_route": "/best-model", "results_route": "/results",
+        "explanation": explanation(
+            "It achieved the highest overall SMAPE accuracy across all age groups.",
+            "It produced stable and smooth multi-year forecasts.",
+            "It generalized well without overfitting.",
+            "It captured long-term trends in the age-group emigration data."
+        )
+    }
+)
+
+register_domain(
+    "education", "public/models_education", "education_yearly.csv",
+    legacy={
+        # was 5001, which the unified server owns
+        "script": "education_predictor.py", "port": 5004,
+        "best_model_route": "/education-best-model", "results_route": "/education-results",
+        "explanation": explanation(
+            "It achieved the highest validation accuracy among all trained MLP architectures.",
+            "It produced consistently low MAE, RMSE, and MAPE values.",
+            "It demonstrated stable long-term forecasting behavior.",
+            "It generalized well across different education groups.",
+            "It avoided overfitting during training and validation."
+        )
+    }
+)
+
+# civil status: clamp to >= 0 and sqrt-transform the tiny categories
+register_domain(
+    "civil", "public/models_emigrants", "emigrants_marital_status.csv",
+    clamp=True, tiny_default=["notReported"],
+    legacy={
+        "script": "emigrants_predict_server.py", "port": 5003,
+        "best_model_route": "/best-model", "results_route": "/results",
+        "explanation": explanation(
+            "It achieved the highest average forecast accuracy across all marital categories.",
+            "It has stable and smooth multi-year predictions.",
+            "It generalizes well without overfitting.",
+            "It captures long-term migration patterns."
+        )
+    }
+)
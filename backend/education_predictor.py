@@ -1,180 +1,21 @@
 # -*- coding: utf-8 -*-
 """
 education_predictor.py
-Updated to match the gender predictor API structure.
-Includes /predict-education-all endpoint (FIXED).
-"""
-
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import pickle
-import numpy as np
-import pandas as pd
-import json
-import os
-
-app = Flask(__name__)
-CORS(app)
-
-# ======================================================
-# MODEL DIRECTORY FOR EDUCATION MODELS
-# ======================================================
-MODEL_DIR = "public/models_education"
-
-# ======================================================
-# LOAD BEST MODEL NAME
-# ======================================================
-best_path = os.path.join(MODEL_DIR, "best_model.json")
-with open(best_path, "r") as f:
-    best_model_name = json.load(f)["best"]
-
-print(f"🎯 Best education model: {best_model_name}")
-
-# Load the .pkl model file
-model_path = os.path.join(MODEL_DIR, f"{best_model_name}.pkl")
-with open(model_path, "rb") as f:
-    data = pickle.load(f)
-
-edu_models = data["models"]          # dict: category → MLP model
-edu_scalers = data["scalers"]        # dict: category → MinMaxScaler
-WINDOW = data["window"]
-CATEGORIES = data["categories"]
-
-# ======================================================
-# STATIC EXPLANATION
-# ======================================================
-model_explanation = {
-    "title": "Why this model was selected",
-    "points": [
-        "It achieved the highest validation accuracy among all trained MLP architectures.",
-        "It produced consistently low MAE, RMSE, and MAPE values.",
-        "It demonstrated stable long-term forecasting behavior.",
-        "It generalized well across different education groups.",
-        "It avoided overfitting during training and validation."
-    ]
-}
-
-# ======================================================
-# FORECAST FUNCTION
-# ======================================================
-def forecast(model, scaler, last_values, steps=10):
-    preds = []
-    current = last_values.copy()
-
-    for _ in range(steps):
-        inp = current[-WINDOW:].reshape(1, -1)
-        pred_scaled = model.predict(inp)[0]
-        pred = scaler.inverse_transform(pred_scaled.reshape(1, -1))[0][0]
-        preds.append(float(pred))
-
-        current = np.vstack([current, pred_scaled.reshape(1, -1)])
-
-    return preds
-
-# ======================================================
-# SINGLE CATEGORY PREDICTION
-# ======================================================
-@app.route("/predict-education")
-def predict_education():
-
-    category = request.args.get("category")
-
-    if category not in CATEGORIES:
-        return jsonify({
-            "error": f"Invalid category. Must be one of: {CATEGORIES}"
-        }), 400
-
-    model = edu_models[category]
-    scaler = edu_scalers[category]
 
-    df = pd.read_csv("education_yearly.csv")
-    values = df[category].values.reshape(-1, 1)
+Education forecast server: /predict-education, /predict-education-all,
+/education-best-model, /education-results
 
-    scaled = scaler.transform(values)
-    last_values = scaled[-WINDOW:]
-
-    preds = forecast(model, scaler, last_values, steps=10)
-
-    last_year = int(df["year"].iloc[-1])
-    future_years = list(range(last_year + 1, last_year + 11))
-
-    return jsonify({
-        "dataset": "education",
-        "category": category,
-        "future_years": future_years,
-        "forecast": preds,
-        "model_used": best_model_name,
-        "explanation": model_explanation
-    })
-
-# ======================================================
-# ALL CATEGORIES AT ONCE  (FIXED ENDPOINT)
-# ======================================================
-@app.route("/predict-education-all")
-def predict_education_all():
-
-    df = pd.read_csv("education_yearly.csv")
-    output = {}
-
-    for category in CATEGORIES:
-
-        model = edu_models[category]
-        scaler = edu_scalers[category]
-
-        values = df[category].values.reshape(-1, 1)
-        scaled = scaler.transform(values)
-        last_values = scaled[-WINDOW:]
-
-        preds = forecast(model, scaler, last_values, steps=10)
-
-        last_year = int(df["year"].iloc[-1])
-        years = list(range(last_year + 1, last_year + 11))
-
-        # GENERATE ROW FORMAT FOR TABLE
-        rows = [
-            {"year": y, "predicted": float(p)}
-            for y, p in zip(years, preds)
-        ]
-
-        output[category] = rows
-
-    return jsonify({
-        "dataset": "education",
-        "model_used": best_model_name,
-        "results": output,
-        "explanation": model_explanation
-    })
-
-# ======================================================
-# BEST MODEL RESULT
-# ======================================================
-@app.route("/education-best-model")
-def education_best_model():
-
-    results_path = os.path.join(MODEL_DIR, "results.json")
-    with open(results_path, "r") as f:
-        results = json.load(f)
-
-    best = results["best_model"]
+The routes and their bodies are served by the unified backend from its
+shared packs, datasets and caches (server.py, LEGACY SERVERS, also at
+/legacy/education/...). This script runs them alone on port 5004: their old
+port 5001 belongs to the unified server. `python serve.py --legacy`
+serves every dashboard from one process.
+"""
 
-    return jsonify({
-        "best": best,
-        "metrics": results[best],
-        "all_results": results,
-        "explanation": model_explanation
-    })
+from server import legacy_app
 
-# ======================================================
-# FULL RESULTS
-# ======================================================
-@app.route("/education-results")
-def education_results():
-    path = os.path.join(MODEL_DIR, "results.json")
-    with open(path, "r") as f:
-        return jsonify(json.load(f))
+app = legacy_app("education")
 
-# ======================================================
-# RUN SERVER
-# ======================================================
 if __name__ == "__main__":
-    app.run(port=5001)
+    print("🚀 Starting Education legacy server on port 5004...")
+    app.run(port=5004)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+forecast_cache.py
+
+Bounded LRU + TTL cache for forecast results.
+
+A forecast only changes when the model pack or the input CSV changes, so
+cache keys carry the version of the loaded pack (file fingerprints taken
+when it was loaded, see model_registry.pack_version) and a fingerprint
+(inode + mtime + size) of the CSV. Publishing a new CSV produces a new
+key and the stale entry simply ages out of the LRU; a hot model reload
+invalidates the entries of the replaced version.
+
+Misses are single-flight: concurrent requests for the same key (same
+domain, category, horizon and model / data version) wait on the one
+in-flight computation and share its result instead of each running the
+recursion. /cache-stats reports the coalescing ratio.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ============================================================
+# FINGERPRINTS
+# ============================================================
+
+def file_fingerprint(path):
+    """Cheap content fingerprint of a file: (inode, mtime_ns, size)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def forecast_key(domain, category, steps, model_name, model_version, csv_path):
+    return (
+        domain,
+        category,
+        steps,
+        model_name,
+        model_version,
+        file_fingerprint(csv_path)
+    )
+
+# ============================================================
+# SINGLE-FLIGHT
+# ============================================================
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight computation."""
+
+    def __init__(self):
+        self.computations = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "value": None, "error": None}
+                self._calls[key] = call
+                self.computations += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["value"]
+
+        try:
+            call["value"] = fn()
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+        return call["value"]
+
+    def stats(self):
+        with self._lock:
+            total = self.computations + self.coalesced
+            return {
+                "in_flight": len(self._calls),
+                "computations": self.computations,
+                "coalesced": self.coalesced,
+                "coalescing_ratio": self.coalesced / total if total else 0.0
+            }
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class ForecastCache:
+
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def _peek(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+            return entry[1]
+        return None
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = self._flight.do(key, lambda: self._fill(key, compute))
+        return value
+
+    def _fill(self, key, compute):
+        # a flight that finished between our miss and do() already stored it
+        value = self._peek(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def invalidate(self, predicate):
+        """Drop every entry whose key matches `predicate`; returns the count."""
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / total if total else 0.0
+            }
+        stats.update(self._flight.stats())
+        return stats
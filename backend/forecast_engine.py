@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+forecast_engine.py
+
+Shared recursive forecast engine used by every prediction server.
+
+Instead of calling MLPRegressor.predict once per future year, the trained
+weights (coefs_ / intercepts_ / activation) are read straight from the
+pickled model and evaluated with plain NumPy:
+ - the rolling window lives in one preallocated buffer (no np.vstack)
+ - each step is a raw matmul chain (no sklearn input validation)
+ - the scaler inverse transform runs once over the whole horizon
+
+The arithmetic is the same as sklearn's forward pass, so the forecasts are
+bit-identical to the old per-step predict loop.
+"""
+
+import threading
+
+import numpy as np
+
+# ============================================================
+# ACTIVATIONS (in-place, same as sklearn.neural_network._base)
+# ============================================================
+
+def _identity(x):
+    pass
+
+
+def _relu(x):
+    np.maximum(x, 0, out=x)
+
+
+def _tanh(x):
+    np.tanh(x, out=x)
+
+
+def _logistic(x):
+    from scipy.special import expit
+    expit(x, out=x)
+
+
+ACTIVATIONS = {
+    "identity": _identity,
+    "relu": _relu,
+    "tanh": _tanh,
+    "logistic": _logistic
+}
+
+# ============================================================
+# NETWORK + SCALER ACCESS
+# ============================================================
+
+def as_network(model):
+    """
+    Return the raw layer weights of a fitted MLPRegressor. Networks loaded
+    from model_artifacts are already in this form and pass through.
+    """
+    if isinstance(model, dict):
+        return model
+    return {
+        "coefs": model.coefs_,
+        "intercepts": model.intercepts_,
+        "activation": model.activation,
+        "out_activation": model.out_activation_
+    }
+
+
+def forward_pass(net, X):
+    """Evaluate the network on a 2D input, exactly like predict()."""
+    coefs = net["coefs"]
+    intercepts = net["intercepts"]
+    hidden = ACTIVATIONS[net["activation"]]
+    last = len(coefs) - 1
+
+    activation = X
+    for i in range(len(coefs)):
+        activation = activation @ coefs[i]
+        activation += intercepts[i]
+        if i != last:
+            hidden(activation)
+    ACTIVATIONS[net["out_activation"]](activation)
+    return activation
+
+
+def inverse_transform(scaler, values):
+    """MinMaxScaler.inverse_transform for a 1D array of scaled values."""
+    out = np.array(values, dtype=np.float64)
+    out -= scaler.min_[0]
+    out /= scaler.scale_[0]
+    return out
+
+# ============================================================
+# RECURSIVE FORECAST
+# ============================================================
+
+def forecast_scaled(model, last_vals, steps=10, window=3):
+    """
+    Roll the model forward `steps` times starting from the scaled
+    `last_vals` window. Returns the scaled predictions (1D array).
+    """
+    net = as_network(model)
+
+    buf = np.empty(window + steps, dtype=np.float64)
+    buf[:window] = np.ravel(last_vals)[-window:]
+
+    for i in range(steps):
+        X = buf[i:i + window].reshape(1, -1)
+        buf[window + i] = forward_pass(net, X)[0, 0]
+
+    return buf[window:]
+
+
+def forecast(model, scaler, last_vals, steps=10, window=3,
+             clamp=False, square=False):
+    """
+    Full forecast in original units, returned as a list of floats.
+
+    clamp  -> negative predictions are clipped to 0
+    square -> undo a sqrt input transform (tiny categories), clipped to 0
+    """
+    preds = inverse_transform(scaler, forecast_scaled(model, last_vals, steps, window))
+
+    if clamp:
+        preds = np.maximum(preds, 0)
+    if square:
+        preds = np.maximum(preds ** 2, 0)
+
+    return preds.tolist()
+
+# ============================================================
+# BATCHED CROSS-CATEGORY FORECAST
+# ============================================================
+
+_STACK_CACHE = {}
+_STACK_CACHE_MAX = 32
+_STACK_LOCK = threading.Lock()  # request threads stack, the reload watcher drops
+
+
+def _layer_signature(net):
+    return (
+        net["activation"],
+        net["out_activation"],
+        tuple(c.shape for c in net["coefs"])
+    )
+
+
+def stack_networks(models, dtype=np.float64):
+    """
+    Group models with identical layer shapes and stack their weights.
+
+    Returns a list of (row_indices, stacked_net) where stacked_net holds
+    coefs of shape (G, n_in, n_out) and intercepts of shape (G, 1, n_out).
+    Stacks are cached per tuple of model objects (and dtype).
+    """
+    key = (tuple(id(m) for m in models), np.dtype(dtype).str)
+    with _STACK_LOCK:
+        hit = _STACK_CACHE.get(key)
+    if hit is not None:
+        return hit[1]
+
+    nets = [as_network(m) for m in models]
+
+    groups = {}
+    for i, net in enumerate(nets):
+        groups.setdefault(_layer_signature(net), []).append(i)
+
+    stacked = []
+    for (activation, out_activation, shapes), rows in groups.items():
+        stacked.append((np.array(rows), {
+            "coefs": [np.stack([nets[r]["coefs"][k] for r in rows]).astype(dtype, copy=False)
+                      for k in range(len(shapes))],
+            "intercepts": [np.stack([nets[r]["intercepts"][k] for r in rows])[:, None, :]
+                           .astype(dtype, copy=False)
+                           for k in range(len(shapes))],
+            "activation": activation,
+            "out_activation": out_activation
+        }))
+
+    with _STACK_LOCK:
+        if len(_STACK_CACHE) >= _STACK_CACHE_MAX:
+            _STACK_CACHE.clear()
+        # keep the models referenced so their ids cannot be reused
+        _STACK_CACHE[key] = (tuple(models), stacked)
+    return stacked
+
+
+def drop_stacks(models):
+    """Forget cached stacks that contain any of `models` (e.g. evicted packs)."""
+    ids = {id(m) for m in models}
+    with _STACK_LOCK:
+        for key in [k for k in _STACK_CACHE if ids.intersection(k[0])]:
+            del _STACK_CACHE[key]
+
+
+def stack_stats():
+    """Entries and weight bytes held by the stack cache."""
+    with _STACK_LOCK:
+        cached = [stacked for _, stacked in _STACK_CACHE.values()]
+    nbytes = sum(a.nbytes for stacked in cached for _, net in stacked
+                 for a in net["coefs"] + net["intercepts"])
+    return {"entries": len(cached), "max_entries": _STACK_CACHE_MAX, "bytes": nbytes}
+
+
+def forecast_scaled_batch(models, last_vals, steps=10, window=3):
+    """
+    Advance every category's recursion together.
+
+    models    -> list of C fitted models
+    last_vals -> list of C scaled windows (each at least `window` long)
+    Returns a (C, steps) array of scaled predictions.
+    """
+    n = len(models)
+    buf = np.empty((n, window + steps), dtype=np.float64)
+    for i, vals in enumerate(last_vals):
+        buf[i, :window] = np.ravel(vals)[-window:]
+
+    stacked = stack_networks(models)
+
+    for s in range(steps):
+        for rows, net in stacked:
+            X = buf[rows, s:s + window][:, None, :]
+            buf[rows, window + s] = forward_pass(net, X)[:, 0, 0]
+
+    return buf[:, window:]
+
+
+def forecast_batch(models, scalers, last_vals, steps=10, window=3,
+                   clamp=False, square=None):
+    """
+    Batched version of forecast() for a whole domain.
+
+    square -> optional list of per-category flags (tiny categories)
+    Returns one list of floats per category, in input order.
+    """
+    scaled = forecast_scaled_batch(models, last_vals, steps, window)
+    return to_values(scaled, scalers, clamp, square).tolist()
+
+
+def to_values(scaled, scalers, clamp=False, square=None):
+    """
+    Inverse-scale a (C, ...) array of scaled predictions, one scaler per
+    leading row, then apply the clamp / square (tiny category) rules.
+    """
+    shape = (len(scalers),) + (1,) * (scaled.ndim - 1)
+    mins = np.array([s.min_[0] for s in scalers]).reshape(shape)
+    scales = np.array([s.scale_[0] for s in scalers]).reshape(shape)
+    preds = (scaled - mins) / scales
+
+    if clamp:
+        preds = np.maximum(preds, 0)
+    if square is not None and any(square):
+        rows = np.flatnonzero(square)
+        preds[rows] = np.maximum(preds[rows] ** 2, 0)
+
+    return preds
+
+# ============================================================
+# MANY PATHS PER CATEGORY
+# ============================================================
+
+def forecast_scaled_paths(models, windows, steps=10, noise=None, dtype=np.float64):
+    """
+    Advance P recursions per category together (backtest origins,
+    Monte Carlo simulations): every step is one stacked forward pass
+    over all categories and paths.
+
+    models  -> list of C fitted models
+    windows -> (C, P, window) scaled start windows
+    noise   -> optional (C, P, steps) scaled perturbations, added to each
+               step's prediction before it is fed back
+    dtype   -> float32 roughly halves the matmul cost of large batches
+    Returns a (C, P, steps) array of scaled predictions.
+    """
+    n, paths, window = windows.shape
+    buf = np.empty((n, paths, window + steps), dtype=dtype)
+    buf[:, :, :window] = windows
+
+    stacked = stack_networks(models, dtype)
+
+    for s in range(steps):
+        for rows, net in stacked:
+            out = forward_pass(net, buf[rows, :, s:s + window])[:, :, 0]
+            if noise is not None:
+                out += noise[rows, :, s]
+            buf[rows, :, window + s] = out
+
+    return buf[:, :, window:]
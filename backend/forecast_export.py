@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+forecast_export.py
+
+Bulk export of every forecast (domain × category × model) as one
+long-format table, streamed chunk by chunk:
+
+  domain, category, model, best, year, value
+  [, median, lower_<L>, upper_<L> for each interval level L]
+
+The rows come from the serving path in server.py (export_chunks): the
+memory-mapped packs in public/models*, one batched recursion per domain
+for all architectures and the forecast cache, so an export also warms
+the cache. Each (domain, model) is one chunk, written and flushed before
+the next one is computed; the full table is never held in memory.
+
+Formats:
+  csv      always available
+  arrow    Arrow IPC stream      (optional `pyarrow`)
+  parquet  one row group / chunk (optional `pyarrow`)
+
+The same export is served as GET /export?format=csv&domains=age,civil
+&models=all&intervals=80,95 by server.py.
+
+Usage (from backend/):
+  python forecast_export.py --format csv > forecasts.csv
+  python forecast_export.py --format parquet --models best --intervals 80,95 -o forecasts.parquet
+"""
+
+import argparse
+import csv
+import importlib.util
+import io
+import sys
+
+# optional dependency (CSV only without it); imported on first arrow /
+# parquet export, not with the server: pyarrow is slow to import
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+FORMATS = {
+    "csv": {"mimetype": "text/csv", "extension": "csv"},
+    "arrow": {"mimetype": "application/vnd.apache.arrow.stream", "extension": "arrows"},
+    "parquet": {"mimetype": "application/vnd.apache.parquet", "extension": "parquet"}
+}
+
+# ============================================================
+# TABLE LAYOUT
+# ============================================================
+
+def column_names(levels=None):
+    names = ["domain", "category", "model", "best", "year", "value"]
+    if levels:
+        names.append("median")
+        for lv in levels:
+            names += [f"lower_{lv}", f"upper_{lv}"]
+    return names
+
+
+def chunk_columns(domain, model, best, years, forecasts, bands=None, levels=None):
+    """
+    Long-format columns of one (domain, model):
+    forecasts {category: values per year}, bands {category: quantile bands}.
+    """
+    cols = {name: [] for name in column_names(levels)}
+    steps = len(years)
+    for cat, values in forecasts.items():
+        cols["domain"] += [domain] * steps
+        cols["category"] += [cat] * steps
+        cols["model"] += [model] * steps
+        cols["best"] += [model == best] * steps
+        cols["year"] += years
+        cols["value"] += values
+        if levels:
+            band = bands[cat]
+            cols["median"] += band["median"]
+            for lv in levels:
+                cols[f"lower_{lv}"] += band[str(lv)]["lower"]
+                cols[f"upper_{lv}"] += band[str(lv)]["upper"]
+    return cols
+
+# ============================================================
+# STREAMING WRITERS
+# ============================================================
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file that hands back the bytes written since the last take()."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def arrow_schema(levels=None):
+    import pyarrow as pa
+
+    fields = [("domain", pa.string()), ("category", pa.string()), ("model", pa.string()),
+              ("best", pa.bool_()), ("year", pa.int32()), ("value", pa.float64())]
+    fields += [(name, pa.float64()) for name in column_names(levels)[len(fields):]]
+    return pa.schema(fields)
+
+
+def stream_csv(chunks, levels=None):
+    buf = io.StringIO()
+    out = csv.writer(buf, lineterminator="\n")
+    out.writerow(column_names(levels))
+    for cols in chunks:
+        out.writerows(zip(*cols.values()))
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+def stream_arrow(chunks, levels=None, parquet=False):
+    if not HAS_PYARROW:
+        raise RuntimeError("arrow / parquet export needs the optional pyarrow package")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(levels)
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if parquet else pa.ipc.new_stream(sink, schema)
+    for cols in chunks:
+        table = pa.Table.from_pydict(cols, schema=schema)
+        writer.write_table(table)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def stream_table(chunks, fmt="csv", levels=None):
+    """Encoded byte chunks of the table in `fmt` (see FORMATS)."""
+    if fmt == "csv":
+        return stream_csv(chunks, levels)
+    if fmt in ("arrow", "parquet"):
+        return stream_arrow(chunks, levels, parquet=fmt == "parquet")
+    raise ValueError(f"format must be one of {list(FORMATS)}")
+
+
+def available_formats():
+    return [f for f in FORMATS if f == "csv" or HAS_PYARROW]
+
+# ============================================================
+# CLI
+# ============================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--domains", default="",
+                        help="comma separated (default: every served domain)")
+    parser.add_argument("--models", choices=["all", "best"], default="all")
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--intervals", help="band levels in %%, e.g. 80,95")
+    parser.add_argument("--paths", type=int, help="Monte Carlo paths for --intervals")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.format not in available_formats():
+        parser.error(f"--format {args.format} needs the optional pyarrow package")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    import server  # shared packs, datasets and batched forecast path
+    from forecast_intervals import parse_intervals
+    from werkzeug.datastructures import MultiDict
+
+    query = MultiDict({k: v for k, v in [("intervals", args.intervals), ("paths", args.paths)]
+                       if v is not None})
+    intervals = parse_intervals(query)
+    domains = [d for d in args.domains.split(",") if d] or server.MODELS.domains
+
+    levels = intervals[0] if intervals else None
+    plan = server.export_plan(domains, args.models, intervals)
+    chunks = server.export_chunks(plan, args.models, args.steps, intervals)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for data in stream_table(chunks, args.format, levels):
+            out.write(data)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+forecast_intervals.py
+
+Monte Carlo prediction intervals for the recursive forecasts.
+
+train.py writes every model's validation residuals (actual - predicted,
+in the model's scaled space) to <model dir>/residuals.json. A forecast
+with ?intervals= simulates `paths` recursive forecasts per category:
+each step's prediction is perturbed with a residual resampled from that
+category's validation errors before it is fed back into the window.
+All paths of all categories advance through one stacked forward pass
+per step (forecast_engine.forecast_scaled_paths), in float32: the
+rounding is orders of magnitude below the resampled noise. The residual
+draws are a single vectorized index into the pooled residuals.
+
+The paths are converted to values like the point forecast (inverse
+scaling, clamp, square for sqrt-transformed tiny categories), so the
+bands obey the same rules, and are summarized per step as the median
+and central quantile bands:
+
+  ?intervals=80,95     levels in %  ("1" / "true" = DEFAULT_LEVELS)
+  ?paths=5000          simulations per category (<= MAX_PATHS)
+
+Simulations are seeded per category (by name), so a category gets the
+same bands whether it is forecast alone or with its whole domain.
+"""
+
+import json
+import os
+import zlib
+
+import numpy as np
+
+import forecast_engine as engine
+from model_artifacts import replace_file
+
+RESIDUALS_FILE = "residuals.json"
+RESIDUALS_FORMAT = 1
+
+DEFAULT_LEVELS = [80, 95]
+DEFAULT_PATHS = int(os.environ.get("INTERVAL_PATHS", 5000))
+MAX_PATHS = 20000
+SEED = 0
+
+
+class IntervalError(ValueError):
+    """Bad ?intervals= / ?paths= parameters."""
+
+
+class ResidualsMissing(Exception):
+    """No validation residuals stored for the served model."""
+
+# ============================================================
+# RESIDUALS (written by train.py)
+# ============================================================
+
+def save_residuals(output_dir, residuals):
+    """residuals: {model name: {category: 1D array of scaled residuals}}"""
+    doc = {
+        "format": RESIDUALS_FORMAT,
+        "space": "scaled",
+        "models": {
+            name: {cat: np.asarray(r, dtype=float).tolist() for cat, r in cats.items()}
+            for name, cats in residuals.items()
+        }
+    }
+    with replace_file(os.path.join(output_dir, RESIDUALS_FILE), "w") as f:
+        json.dump(doc, f)
+
+
+def load_residuals(directory, model_name, categories=None):
+    """
+    {category: residual array} of one model, or raise ResidualsMissing
+    (also when one of `categories` has no residuals).
+    """
+    try:
+        with open(os.path.join(directory, RESIDUALS_FILE), "r") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        doc = {}
+
+    cats = doc.get("models", {}).get(model_name) if doc.get("format") == RESIDUALS_FORMAT else None
+    if not cats:
+        raise ResidualsMissing(f"no validation residuals for {model_name} in {directory} "
+                               f"(run train.py)")
+
+    missing = [c for c in categories or [] if not cats.get(c)]
+    if missing:
+        raise ResidualsMissing(f"no validation residuals for {model_name} {missing} "
+                               f"in {directory} (run train.py)")
+    return {cat: np.asarray(r, dtype=np.float64) for cat, r in cats.items()}
+
+# ============================================================
+# REQUEST PARAMETERS
+# ============================================================
+
+def parse_intervals(args):
+    """(levels, paths) from the query string, or None without ?intervals=."""
+    value = args.get("intervals")
+    if value is None:
+        return None
+
+    if value.lower() in ("", "1", "true", "yes"):
+        levels = DEFAULT_LEVELS
+    else:
+        try:
+            levels = sorted({float(v) for v in value.split(",") if v.strip()})
+        except ValueError:
+            raise IntervalError("intervals must be a list of levels in %, e.g. 80,95")
+        if not levels or not all(0 < lv < 100 for lv in levels):
+            raise IntervalError("interval levels must be between 0 and 100")
+
+    try:
+        paths = int(args.get("paths", DEFAULT_PATHS))
+    except ValueError:
+        raise IntervalError("paths must be an integer")
+    if not 100 <= paths <= MAX_PATHS:
+        raise IntervalError(f"paths must be 100-{MAX_PATHS}")
+    return [int(lv) if lv == int(lv) else lv for lv in levels], paths
+
+# ============================================================
+# SIMULATION
+# ============================================================
+
+def resample(residuals, paths, steps, rngs):
+    """(C, paths, steps) draws, row c from residuals[c] with rngs[c] (lengths may differ)."""
+    counts = np.array([len(r) for r in residuals])
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    pooled = np.concatenate(residuals)
+
+    picks = np.stack([rng.random((paths, steps)) for rng in rngs]) * counts[:, None, None]
+    return pooled[offsets[:, None, None] + picks.astype(np.intp)]
+
+
+def simulate(models, scalers, last_vals, residuals, steps=10, window=3, paths=DEFAULT_PATHS,
+             clamp=False, square=None, seed=SEED, keys=None):
+    """
+    (C, paths, steps) simulated forecasts in original units.
+    keys -> per-category names seeding each row's draws (default: row index)
+    """
+    start = np.stack([np.ravel(v)[-window:] for v in last_vals])
+    windows = np.broadcast_to(start[:, None, :], (len(models), paths, window))
+
+    keys = range(len(models)) if keys is None else keys
+    rngs = [np.random.default_rng([seed, zlib.crc32(str(k).encode())]) for k in keys]
+    noise = resample(residuals, paths, steps, rngs).astype(np.float32)
+    scaled = engine.forecast_scaled_paths(models, windows, steps, noise, dtype=np.float32)
+    return engine.to_values(scaled, scalers, clamp, square)
+
+
+def quantile_bands(values, levels):
+    """{"median": [...], "80": {"lower": [...], "upper": [...]}, ...} per row."""
+    qs = [50]
+    for lv in levels:
+        qs += [(100 - lv) / 2, 100 - (100 - lv) / 2]
+    table = np.percentile(values, qs, axis=1)  # (len(qs), C, steps)
+
+    bands = []
+    for c in range(values.shape[0]):
+        band = {"median": table[0, c].tolist()}
+        for i, lv in enumerate(levels):
+            band[str(lv)] = {"lower": table[1 + 2 * i, c].tolist(),
+                             "upper": table[2 + 2 * i, c].tolist()}
+        bands.append(band)
+    return bands
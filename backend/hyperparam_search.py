@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+hyperparam_search.py
+
+Budgeted hyperparameter search for the MLP forecasters (Hyperband).
+
+train.py compares three fixed architectures, each trained until it
+converges. This samples many more candidates (hidden layers, learning
+rate, L2 alpha and the sliding WINDOW) and spends the CPU on the
+promising ones: every candidate starts with a few epochs and is scored
+on the same validation avg_accuracy as results.json (the domains'
+MAPE/SMAPE metrics). Only the best 1/eta of each rung is trained further
+(successive halving; the same networks continue with warm_start). Hyperband
+runs several such brackets, from many short trials to a few long ones,
+so slow starters are not all pruned after the first rung.
+
+The budget is counted in model epochs (one epoch of one category's
+network) and/or wall-clock seconds. By default it is one full Hyperband
+iteration (every bracket once); "--budget-epochs grid" uses the epochs
+train.py spent on the three fixed configs (cold_n_iter in
+train_state.json), i.e. the same CPU as the grid.
+
+Output (next to results.json):
+  <model dir>/search_trials.json  ← every trial, rung by rung, and the best
+
+The search only reports: the served mlp1/mlp2/mlp3 packs are not touched.
+Note that candidates with different windows are scored on their own
+validation windows.
+
+Usage (from backend/):
+  python hyperparam_search.py --domains age
+  python hyperparam_search.py --domains age --budget-epochs grid
+  python hyperparam_search.py --domains education --budget-seconds 120
+  python hyperparam_search.py --mode halving --eta 4 --seed 7
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+import warnings
+
+import numpy as np
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.neural_network import MLPRegressor
+from threadpoolctl import threadpool_limits
+
+from model_registry import DOMAINS
+from train import PIPELINES, load_domain, load_state, validation_metrics
+from training_pool import RANDOM_STATE
+
+TRIALS_FILE = "search_trials.json"
+
+SEARCH_SPACE = {
+    "layers": [(16,), (32,), (64,), (16, 16), (32, 32), (64, 32), (64, 64),
+               (128, 64), (128, 128), (64, 64, 64)],
+    "learning_rate_init": (1e-4, 1e-2),  # log-uniform
+    "alpha": (1e-6, 1e-2),               # log-uniform
+    "window": [2, 3, 4, 5, 6]
+}
+
+ETA = 3
+MIN_EPOCHS = 10    # first rung
+MAX_EPOCHS = 270   # last rung (MIN_EPOCHS * ETA^3)
+
+# ============================================================
+# BUDGET
+# ============================================================
+
+class Budget:
+    """Model-epoch and wall-clock allowance shared by all brackets."""
+
+    def __init__(self, epochs=None, seconds=None):
+        self.epochs = epochs
+        self.seconds = seconds
+        self.spent = 0
+        self.start = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def exhausted(self):
+        return ((self.epochs is not None and self.spent >= self.epochs) or
+                (self.seconds is not None and self.elapsed() >= self.seconds))
+
+
+def grid_epochs(domain):
+    """Model epochs train.py's fixed grid used for `domain` (cold fits), or None."""
+    state = load_state(DOMAINS[domain]["directory"])
+    recorded = [cell["cold_n_iter"] for cell in state.values() if "cold_n_iter" in cell]
+    if recorded and len(recorded) == len(state):
+        return sum(recorded)
+    return None
+
+# ============================================================
+# TRIALS
+# ============================================================
+
+def sample_config(rng):
+    def log_uniform(lo, hi):
+        return float(np.exp(rng.uniform(np.log(lo), np.log(hi))))
+
+    layers = SEARCH_SPACE["layers"][rng.integers(len(SEARCH_SPACE["layers"]))]
+    return {
+        "layers": list(layers),
+        "learning_rate_init": log_uniform(*SEARCH_SPACE["learning_rate_init"]),
+        "alpha": log_uniform(*SEARCH_SPACE["alpha"]),
+        "window": int(rng.choice(SEARCH_SPACE["window"]))
+    }
+
+
+def train_trial(trial, data, epochs, budget):
+    """
+    Train every category network of `trial` up to `epochs` in total
+    (continuing the existing ones) and score it on the validation split.
+    """
+    config = trial["config"]
+    start = time.perf_counter()
+    metrics = {}
+
+    with threadpool_limits(limits=1), warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+
+        for cat in data["categories"]:
+            Xtr, _, ytr, _ = data["splits"][cat]
+            model = trial["models"].get(cat)
+            if model is None:
+                model = trial["models"][cat] = MLPRegressor(
+                    hidden_layer_sizes=tuple(config["layers"]),
+                    learning_rate_init=config["learning_rate_init"],
+                    alpha=config["alpha"],
+                    max_iter=epochs,
+                    random_state=RANDOM_STATE
+                )
+            else:
+                model.set_params(max_iter=epochs - trial["epochs"], warm_start=True)
+
+            model.fit(Xtr, ytr.ravel())
+            budget.spent += model.n_iter_
+            metrics[cat] = validation_metrics(data, cat, model)["accuracy"]
+
+    trial["epochs"] = epochs
+    trial["rungs"].append({
+        "epochs": epochs,
+        "avg_accuracy": float(np.mean(list(metrics.values()))),
+        "seconds": time.perf_counter() - start
+    })
+
+
+def score(trial):
+    return trial["rungs"][-1]["avg_accuracy"] if trial["rungs"] else -math.inf
+
+# ============================================================
+# SUCCESSIVE HALVING / HYPERBAND
+# ============================================================
+
+def successive_halving(trials, min_epochs, eta, datasets, budget):
+    """
+    Train `trials` for min_epochs, keep the best 1/eta, multiply the
+    epochs by eta, and repeat up to MAX_EPOCHS. Returns False once the
+    budget ran out.
+    """
+    epochs = min_epochs
+    while True:
+        for trial in trials:
+            if budget.exhausted():
+                for t in trials:
+                    if t["status"] == "running":
+                        t["status"] = "stopped"
+                return False
+            train_trial(trial, datasets[trial["config"]["window"]], epochs, budget)
+
+        trials.sort(key=score, reverse=True)
+        if epochs * eta > MAX_EPOCHS or len(trials) == 1:
+            for trial in trials:
+                trial["status"] = "completed"
+            return True
+
+        keep = max(1, len(trials) // eta)
+        for trial in trials[keep:]:
+            trial["status"] = "pruned"
+            trial["models"].clear()
+        trials = trials[:keep]
+        epochs *= eta
+
+
+def brackets(mode, eta):
+    """(number of trials, first-rung epochs) of one Hyperband iteration."""
+    s_max = int(math.log(MAX_EPOCHS / MIN_EPOCHS, eta) + 1e-9)
+    if mode == "halving":
+        return [(eta ** s_max, MIN_EPOCHS)]
+    return [
+        (math.ceil((s_max + 1) / (s + 1) * eta ** s), MAX_EPOCHS // eta ** s)
+        for s in range(s_max, -1, -1)
+    ]
+
+
+def iteration_epochs(mode, eta, n_categories):
+    """Model epochs of one full Hyperband iteration (all brackets, no early stops)."""
+    total = 0
+    for n, epochs in brackets(mode, eta):
+        trained = 0  # survivors continue, so each rung adds the difference
+        while True:
+            total += n * (epochs - trained)
+            if epochs * eta > MAX_EPOCHS or n == 1:
+                break
+            n, trained, epochs = max(1, n // eta), epochs, epochs * eta
+    return total * n_categories
+
+
+def search_domain(domain, budget, mode="hyperband", eta=ETA, seed=0):
+    rng = np.random.default_rng(seed)
+    datasets = {w: load_domain(domain, w) for w in SEARCH_SPACE["window"]}
+    trials = []
+
+    running = True
+    while running:  # Hyperband iterations until the budget is spent
+        for b, (n, min_epochs) in enumerate(brackets(mode, eta)):
+            bracket = [
+                {"trial": len(trials) + i, "bracket": b, "config": sample_config(rng),
+                 "status": "running", "epochs": 0, "rungs": [], "models": {}}
+                for i in range(n)
+            ]
+            trials.extend(bracket)
+            if not successive_halving(list(bracket), min_epochs, eta, datasets, budget):
+                running = False
+                break
+
+    for trial in trials:
+        trial.pop("models")
+    return [t for t in trials if t["rungs"]]
+
+# ============================================================
+# OUTPUT
+# ============================================================
+
+def baseline_results(output_dir):
+    """avg_accuracy of the fixed configs from results.json, if present."""
+    try:
+        with open(os.path.join(output_dir, "results.json"), "r") as f:
+            results = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {k: v["avg_accuracy"] for k, v in results.items() if isinstance(v, dict)}
+
+
+def run(domain, mode, eta, seed, budget_epochs=None, budget_seconds=None):
+    output_dir = DOMAINS[domain]["directory"]
+
+    grid = grid_epochs(domain)
+    if budget_epochs == "grid":
+        if grid is None:
+            raise SystemExit(f"❌ {domain}: no cold fit stats in train_state.json "
+                             "(run train.py --full first)")
+        budget_epochs = grid
+    elif budget_epochs is None and budget_seconds is None:
+        budget_epochs = iteration_epochs(mode, eta, len(load_domain(domain)["categories"]))
+    budget = Budget(budget_epochs, budget_seconds)
+
+    print(f"\n🔎 {domain}: {mode} search, budget "
+          f"{budget_epochs or '-'} epochs / {budget_seconds or '-'} s (grid: {grid or '?'} epochs)")
+    trials = search_domain(domain, budget, mode, eta, seed)
+
+    best = max(trials, key=score) if trials else None
+    baseline = baseline_results(output_dir)
+    history = {
+        "domain": domain,
+        "mode": mode,
+        "eta": eta,
+        "min_epochs": MIN_EPOCHS,
+        "max_epochs": MAX_EPOCHS,
+        "seed": seed,
+        "search_space": SEARCH_SPACE,
+        "budget": {"epochs": budget_epochs, "seconds": budget_seconds},
+        "spent": {"epochs": budget.spent, "seconds": budget.elapsed()},
+        "grid_epochs": grid,
+        "baseline": baseline,
+        "best": best,
+        "trials": trials
+    }
+    with open(os.path.join(output_dir, TRIALS_FILE), "w") as f:
+        json.dump(history, f, indent=4)
+
+    pruned = sum(t["status"] == "pruned" for t in trials)
+    print(f"   {len(trials)} trials ({pruned} pruned), "
+          f"{budget.spent} epochs, {budget.elapsed():.2f} s")
+    if best:
+        print(f"🏆 best trial {best['trial']}: {score(best):.2f}% "
+              f"{best['config']} at {best['epochs']} epochs")
+    if baseline:
+        name = max(baseline, key=baseline.get)
+        print(f"   fixed grid best: {name} {baseline[name]:.2f}%")
+    return history
+
+# ============================================================
+# CLI
+# ============================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domains", default=",".join(PIPELINES),
+                        help="comma separated: gender,age,education,civil")
+    parser.add_argument("--mode", choices=["hyperband", "halving"], default="hyperband")
+    parser.add_argument("--eta", type=int, default=ETA,
+                        help="keep the best 1/eta of each rung")
+    parser.add_argument("--budget-epochs",
+                        help="model epochs, or 'grid' for what the fixed configs used "
+                             "(default: one full Hyperband iteration)")
+    parser.add_argument("--budget-seconds", type=float,
+                        help="wall-clock seconds per domain")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    args.domains = [d.strip() for d in args.domains.split(",") if d.strip()]
+    unknown = [d for d in args.domains if d not in PIPELINES]
+    if unknown:
+        parser.error(f"unknown domain(s): {unknown}")
+    if args.eta < 2:
+        parser.error("--eta must be at least 2")
+    if args.budget_epochs not in (None, "grid"):
+        if not args.budget_epochs.isdigit():
+            parser.error("--budget-epochs must be a number or 'grid'")
+        args.budget_epochs = int(args.budget_epochs)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    for domain in args.domains:
+        run(domain, args.mode, args.eta, args.seed, args.budget_epochs, args.budget_seconds)
+
+
+if __name__ == "__main__":
+    main()
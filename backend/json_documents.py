@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+json_documents.py
+
+Pre-serialized JSON documents (results.json and the payloads derived from
+it) for the metrics endpoints.
+
+Each registered document is parsed, built and serialized to bytes once,
+then served as-is with a strong ETag and Cache-Control header; clients
+sending a matching If-None-Match get a bodyless 304. A cheap os.stat()
+per request notices when the source file changes (retraining) and the
+document is rebuilt in one reference swap.
+
+The same bytes can be spliced into larger responses (embed()), so the
+forecast endpoints that embed results.json no longer re-encode it. Those
+endpoints honour ?fields= (alias ?include=), a comma separated list of
+top-level keys to return, e.g. ?fields=forecast,years drops the
+explanation / allModelResults / best_model sections.
+
+Compressed variants (see response_compression) are produced once per
+document version and encoding, each with its own ETag.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from flask import Response, request
+
+from forecast_cache import file_fingerprint
+from response_compression import compress, encode_response, negotiate_encoding
+
+CACHE_CONTROL = "public, max-age={}, must-revalidate".format(
+    int(os.environ.get("RESULTS_MAX_AGE", 60))
+)
+
+
+def dumps(obj):
+    """Serialize exactly like Flask's jsonify (sorted keys, compact)."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def build_snapshot(path, build):
+    fingerprint = file_fingerprint(path)
+    with open(path, "r") as f:
+        data = build(json.load(f))
+    body = dumps(data)
+
+    # members of an object document, pre-encoded for embed()
+    members = {}
+    if isinstance(data, dict):
+        members = {k: dumps({k: v})[1:-1] for k, v in data.items()}
+
+    return {
+        "fingerprint": fingerprint,
+        "data": data,
+        "body": body,
+        "members": members,
+        "etag": hashlib.sha1(body).hexdigest(),
+        "encoded": {}
+    }
+
+
+def requested_fields():
+    """Top-level keys requested with ?fields= / ?include=, or None for all."""
+    value = request.args.get("fields") or request.args.get("include")
+    if not value:
+        return None
+    return {f.strip() for f in value.split(",") if f.strip()}
+
+# ============================================================
+# DOCUMENT STORE
+# ============================================================
+
+class JsonDocuments:
+
+    def __init__(self):
+        self._sources = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, path, build=None):
+        """`build` derives the served document from the parsed file."""
+        self._sources[name] = (path, build or (lambda raw: raw))
+        self._snapshots[name] = None
+
+    def get(self, name):
+        path, build = self._sources[name]
+        snap = self._snapshots[name]
+        if snap is None or file_fingerprint(path) != snap["fingerprint"]:
+            with self._lock:
+                snap = self._snapshots[name]
+                if snap is None or file_fingerprint(path) != snap["fingerprint"]:
+                    snap = build_snapshot(path, build)
+                    self._snapshots[name] = snap
+        return snap
+
+    def preload(self):
+        for name in self._sources:
+            self.get(name)
+
+    def data(self, name):
+        return self.get(name)["data"]
+
+    def fragment(self, name, fields=None):
+        """
+        Serialized members of an object document, without the braces
+        (only the keys in `fields` when given).
+        """
+        snap = self.get(name)
+        if fields is None:
+            return snap["body"][1:-1]
+        return b",".join(v for k, v in snap["members"].items() if k in fields)
+
+    def embed(self, payload, name):
+        """`payload` plus the members of document `name`, honouring ?fields=."""
+        fields = requested_fields()
+        if fields is not None:
+            payload = {k: v for k, v in payload.items() if k in fields}
+        return embed_response(payload, self.fragment(name, fields))
+
+    def response(self, name):
+        """
+        Cached bytes with ETag + Cache-Control; 304 on If-None-Match.
+        Compressed once per encoding when the client accepts it.
+        """
+        snap = self.get(name)
+        resp = Response(snap["body"], mimetype="application/json")
+        etag = snap["etag"]
+
+        encoding = negotiate_encoding(len(snap["body"]))
+        if encoding is not None:
+            body = snap["encoded"].get(encoding)
+            if body is None:
+                body = snap["encoded"][encoding] = compress(snap["body"], encoding)
+            encode_response(resp, body, encoding)
+            etag = f"{etag}-{encoding}"
+
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = CACHE_CONTROL
+        return resp.make_conditional(request)
+
+# ============================================================
+# SPLICED RESPONSES
+# ============================================================
+
+def embed_response(payload, fragment):
+    """
+    JSON response for `payload` plus pre-serialized members (a fragment()
+    of another document) without re-encoding them.
+    """
+    body = dumps(payload)
+    if fragment:
+        body = body[:-1] + (b"," if len(body) > 2 else b"") + fragment + b"}"
+    return Response(body, mimetype="application/json")
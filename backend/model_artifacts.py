@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+model_artifacts.py
+
+Compact, memory-mappable model packs.
+
+Each trained pack (mlp1/mlp2/mlp3) is exported next to its .pkl as:
+  <name>.bin            raw float64 buffer with every layer back to back
+  <name>.manifest.json  window, categories, tiny_categories, activations,
+                        scaler min/scale and the offset/shape of each layer
+
+Loading maps the .bin read-only with np.memmap, so start-up is a JSON read
+plus an mmap, worker processes share the same page-cache pages and neither
+sklearn nor pickle is imported on the serving path.
+
+Usage (export the existing .pkl packs):
+  python model_artifacts.py
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+from domain_registry import DOMAINS
+
+FORMAT_VERSION = 1
+ALIGN = 64  # byte alignment of every layer inside the .bin buffer
+
+MODEL_DIRS = [spec["directory"] for spec in DOMAINS.values()]
+
+# ============================================================
+# LIGHTWEIGHT SCALER
+# ============================================================
+
+class MinMaxParams:
+    """
+    Fitted MinMaxScaler without sklearn. transform / inverse_transform do
+    the same in-place float64 arithmetic as sklearn, so results match.
+    """
+
+    def __init__(self, min_, scale_):
+        self.min_ = np.asarray(min_, dtype=np.float64).reshape(-1)
+        self.scale_ = np.asarray(scale_, dtype=np.float64).reshape(-1)
+
+    def transform(self, X):
+        X = np.array(X, dtype=np.float64)
+        X *= self.scale_
+        X += self.min_
+        return X
+
+    def inverse_transform(self, X):
+        X = np.array(X, dtype=np.float64)
+        X -= self.min_
+        X /= self.scale_
+        return X
+
+# ============================================================
+# PACK NORMALIZATION
+# ============================================================
+
+def pack_entries(pack):
+    """
+    (categories, models, scalers) of a pack, treating the gender pack's
+    male/female models as two regular categories.
+    """
+    if "male_model" in pack:
+        categories = ["male", "female"]
+        models = {"male": pack["male_model"], "female": pack["female_model"]}
+        scalers = {"male": pack["scaler_male"], "female": pack["scaler_female"]}
+        return categories, models, scalers
+    return list(pack["categories"]), pack["models"], pack["scalers"]
+
+
+def artifact_paths(directory, name):
+    return (
+        os.path.join(directory, f"{name}.bin"),
+        os.path.join(directory, f"{name}.manifest.json")
+    )
+
+# ============================================================
+# EXPORT
+# ============================================================
+
+def export_pack(pack, directory, name):
+    """Write <name>.bin + <name>.manifest.json for a trained pack."""
+    categories, models, scalers = pack_entries(pack)
+    bin_path, manifest_path = artifact_paths(directory, name)
+
+    offset = 0
+    buffers = []
+    entries = {}
+
+    def place(arr):
+        nonlocal offset
+        arr = np.ascontiguousarray(arr, dtype="<f8")
+        pad = (-offset) % ALIGN
+        if pad:
+            buffers.append(b"\0" * pad)
+            offset += pad
+        ref = {"offset": offset, "shape": list(arr.shape)}
+        buffers.append(arr.tobytes())
+        offset += arr.nbytes
+        return ref
+
+    for cat in categories:
+        model = models[cat]
+        scaler = scalers[cat]
+        entries[cat] = {
+            "activation": model.activation,
+            "out_activation": model.out_activation_,
+            "layers": [
+                {"coef": place(W), "intercept": place(b)}
+                for W, b in zip(model.coefs_, model.intercepts_)
+            ],
+            "scaler": {
+                "min": [float(v) for v in scaler.min_],
+                "scale": [float(v) for v in scaler.scale_]
+            }
+        }
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "kind": "gender" if "male_model" in pack else "categories",
+        "dtype": "<f8",
+        "window": pack["window"],
+        "categories": categories,
+        "tiny_categories": pack.get("tiny_categories"),
+        "models": entries
+    }
+
+    # weights first, manifest last: a manifest always points at a full .bin.
+    # Both go to a temp file that replaces the old one: running servers have
+    # the old .bin memory-mapped and keep their own inode (rewriting it in
+    # place would change their weights, truncating it would SIGBUS them).
+    with replace_file(bin_path, "wb") as f:
+        for buf in buffers:
+            f.write(buf)
+    with replace_file(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return bin_path, manifest_path
+
+
+@contextmanager
+def replace_file(path, mode="wb"):
+    """Write to a temp file next to `path`, then os.replace() it into place."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                               prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+# ============================================================
+# LOAD
+# ============================================================
+
+def load_artifact(directory, name):
+    """
+    Memory-map an exported pack. Returns a dict shaped like the pickled
+    pack, with forecast_engine network dicts in place of MLPRegressor and
+    MinMaxParams in place of MinMaxScaler.
+    """
+    bin_path, manifest_path = artifact_paths(directory, name)
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"unsupported artifact format in {manifest_path}")
+
+    # plain ndarray view over the read-only mapping
+    buf = np.asarray(np.memmap(bin_path, dtype=manifest["dtype"], mode="r"))
+    itemsize = buf.dtype.itemsize
+
+    def view(ref):
+        start = ref["offset"] // itemsize
+        size = int(np.prod(ref["shape"]))
+        return buf[start:start + size].reshape(ref["shape"])
+
+    models, scalers = {}, {}
+    for cat in manifest["categories"]:
+        entry = manifest["models"][cat]
+        models[cat] = {
+            "coefs": [view(layer["coef"]) for layer in entry["layers"]],
+            "intercepts": [view(layer["intercept"]) for layer in entry["layers"]],
+            "activation": entry["activation"],
+            "out_activation": entry["out_activation"]
+        }
+        scalers[cat] = MinMaxParams(entry["scaler"]["min"], entry["scaler"]["scale"])
+
+    if manifest["kind"] == "gender":
+        return {
+            "male_model": models["male"],
+            "female_model": models["female"],
+            "scaler_male": scalers["male"],
+            "scaler_female": scalers["female"],
+            "window": manifest["window"]
+        }
+
+    pack = {
+        "models": models,
+        "scalers": scalers,
+        "window": manifest["window"],
+        "categories": manifest["categories"]
+    }
+    if manifest["tiny_categories"] is not None:
+        pack["tiny_categories"] = manifest["tiny_categories"]
+    return pack
+
+
+def pack_path(directory, name):
+    """File that identifies the pack version (manifest if exported)."""
+    manifest_path = artifact_paths(directory, name)[1]
+    if os.path.exists(manifest_path):
+        return manifest_path
+    return os.path.join(directory, f"{name}.pkl")
+
+
+def load_model(directory, name):
+    """Load a pack: memory-mapped artifact if exported, else the .pkl."""
+    if os.path.exists(artifact_paths(directory, name)[1]):
+        return load_artifact(directory, name)
+
+    import pickle
+    with open(os.path.join(directory, f"{name}.pkl"), "rb") as f:
+        return pickle.load(f)
+
+
+def load_pack(directory):
+    """(best model name, pack) for a model directory."""
+    with open(f"{directory}/best_model.json", "r") as f:
+        best = json.load(f)["best"]
+    return best, load_model(directory, best)
+
+# ============================================================
+# CLI: export every existing .pkl pack
+# ============================================================
+
+if __name__ == "__main__":
+    import pickle
+
+    for directory in MODEL_DIRS:
+        for name in ["mlp1", "mlp2", "mlp3"]:
+            pkl = os.path.join(directory, f"{name}.pkl")
+            if not os.path.exists(pkl):
+                continue
+            with open(pkl, "rb") as f:
+                pack = pickle.load(f)
+            bin_path, _ = export_pack(pack, directory, name)
+            print(f"Exported {pkl} → {bin_path}")
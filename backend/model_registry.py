@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+model_registry.py
+
+Lazy, per-domain model registry for the unified server.
+
+A domain's best pack is loaded the first time a request (or /warmup)
+needs it, so a process that only serves one or two dashboards never maps
+the other packs. SERVE_DOMAINS restricts which domains a process serves:
+
+  SERVE_DOMAINS=age,civil python server.py
+
+Every pack is normalized to the same entry shape (the gender pack's
+male/female models become two regular categories):
+  name, directory, path, window, categories, models, scalers,
+  tiny_categories, clamp, bytes, version
+
+`version` fingerprints the model directory (best_model.json, residuals
+and every mlpN pack file) as it was just before the pack was loaded;
+forecast cache keys carry it, and the hot-reload watcher in server.py
+compares it with the files on disk. swap() replaces a domain's entry in
+one reference assignment: requests holding the old entry finish on it.
+
+ArchitectureRegistry loads every trained architecture of a domain (the
+mlp1/mlp2/mlp3 listed in results.json) for the model-comparison modals.
+Domains are kept in LRU order within COMPARE_MAX_MB of weights. The cap
+covers these packs and their float64 stacks only: forecast_engine's
+stack cache also holds the best packs' stacks and the float32 stacks of
+interval simulations, bounded by entry count instead (_STACK_CACHE_MAX)
+and reported by /cache-stats under "stacks".
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from domain_registry import DOMAINS
+from forecast_cache import file_fingerprint
+from model_artifacts import load_model, load_pack, pack_entries, pack_path
+
+VERSION_FILES = ("best_model.json", "residuals.json")
+PACK_SUFFIXES = (".pkl", ".bin", ".manifest.json")
+
+# ============================================================
+# DOMAINS (declared in domain_registry.py)
+# ============================================================
+
+class DomainNotServed(KeyError):
+    pass
+
+
+def served_domains(value=None):
+    """Domains enabled by SERVE_DOMAINS (comma separated; empty = all)."""
+    if value is None:
+        value = os.environ.get("SERVE_DOMAINS", "")
+    names = [d.strip() for d in value.split(",") if d.strip()]
+    if not names:
+        return list(DOMAINS)
+
+    unknown = [d for d in names if d not in DOMAINS]
+    if unknown:
+        raise ValueError(f"unknown domain(s) in SERVE_DOMAINS: {unknown}")
+    return names
+
+
+def weight_bytes(models):
+    """Bytes of the layer weights of {category: model}."""
+    total = 0
+    for model in models.values():
+        coefs = model["coefs"] if isinstance(model, dict) else model.coefs_
+        intercepts = model["intercepts"] if isinstance(model, dict) else model.intercepts_
+        total += sum(a.nbytes for a in coefs) + sum(a.nbytes for a in intercepts)
+    return total
+
+
+def pack_version(directory):
+    """Fingerprints of best_model.json, residuals.json and every pack file."""
+    try:
+        files = sorted(f for f in os.listdir(directory)
+                       if f in VERSION_FILES or f.endswith(PACK_SUFFIXES))
+    except OSError:
+        return ()
+    return tuple((f, file_fingerprint(os.path.join(directory, f))) for f in files)
+
+
+def build_entry(domain, name=None):
+    """Entry of the best pack of a domain (or of the pack `name`)."""
+    config = DOMAINS[domain]
+    directory = config["directory"]
+    version = pack_version(directory)  # before loading: a concurrent write shows as a change
+
+    if name is None:
+        name, pack = load_pack(directory)
+    else:
+        pack = load_model(directory, name)
+    categories, models, scalers = pack_entries(pack)
+
+    return {
+        "domain": domain,
+        "name": name,
+        "directory": directory,
+        "path": pack_path(directory, name),
+        "window": pack["window"],
+        "categories": categories,
+        "models": models,
+        "scalers": scalers,
+        "tiny_categories": pack.get("tiny_categories", config.get("tiny_default", [])),
+        "clamp": config["clamp"],
+        "bytes": weight_bytes(models),
+        "version": version
+    }
+
+
+def architecture_names(domain):
+    """Architectures with results in the domain's results.json (mlp1, mlp2, ...)."""
+    with open(os.path.join(DOMAINS[domain]["directory"], "results.json"), "r") as f:
+        results = json.load(f)
+    return [k for k, v in results.items() if isinstance(v, dict) and "avg_accuracy" in v]
+
+# ============================================================
+# REGISTRY
+# ============================================================
+
+class ModelRegistry:
+
+    def __init__(self, domains=None):
+        self.domains = served_domains() if domains is None else list(domains)
+        self._entries = {}
+        self._warm = set()
+        self.reloads = 0
+        self._lock = threading.Lock()
+
+    def is_served(self, domain):
+        return domain in self.domains
+
+    def get(self, domain):
+        """Entry for a domain, loading its pack on first use."""
+        if domain not in self.domains:
+            raise DomainNotServed(domain)
+
+        entry = self._entries.get(domain)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(domain)
+                if entry is None:
+                    entry = build_entry(domain)
+                    self._entries[domain] = entry
+        return entry
+
+    def swap(self, domain, entry):
+        """Serve `entry` for the domain from now on; returns the replaced entry."""
+        with self._lock:
+            old = self._entries.get(domain)
+            self._entries[domain] = entry
+            self.reloads += 1
+        return old
+
+    def loaded(self):
+        return [d for d in self.domains if d in self._entries]
+
+    def mark_warm(self, domain):
+        self._warm.add(domain)
+
+    def is_ready(self):
+        return all(d in self._warm for d in self.domains)
+
+
+class ArchitecturesTooLarge(MemoryError):
+    pass
+
+
+class ArchitectureRegistry:
+    """
+    Every architecture of a domain, loaded once. Memory is accounted as
+    the weight bytes of all packs, twice (forecast_engine keeps a float64
+    stacked copy for the batched pass); least recently used domains are
+    evicted to stay within max_bytes. Float32 stacks built when intervals
+    are simulated on these packs (/export?intervals=) are not counted.
+    """
+
+    def __init__(self, domains, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("COMPARE_MAX_MB", 64)) * 2 ** 20)
+        self.domains = list(domains)
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()  # domain -> {"entries": {name: entry}, "bytes"}
+        self._lock = threading.Lock()
+
+    def get(self, domain):
+        if domain not in self.domains:
+            raise DomainNotServed(domain)
+
+        with self._lock:
+            hit = self._entries.get(domain)
+            if hit is not None:
+                self._entries.move_to_end(domain)
+                return hit
+
+            entries = {name: build_entry(domain, name) for name in architecture_names(domain)}
+            size = 2 * sum(e["bytes"] for e in entries.values())
+            if size > self.max_bytes:
+                raise ArchitecturesTooLarge(
+                    f"{domain}: {size} bytes of weights exceed COMPARE_MAX_MB")
+
+            while self._entries and self.used() + size > self.max_bytes:
+                self._evict()
+            hit = self._entries[domain] = {"entries": entries, "bytes": size}
+            return hit
+
+    def used(self):
+        return sum(d["bytes"] for d in self._entries.values())
+
+    def drop(self, domain):
+        """Forget a domain's architectures (reloaded on next use)."""
+        with self._lock:
+            old = self._entries.pop(domain, None)
+        if old is not None:
+            self._release(old)
+
+    def _evict(self):
+        _, old = self._entries.popitem(last=False)
+        self._release(old)
+        self.evictions += 1
+
+    def _release(self, old):
+        from forecast_engine import drop_stacks
+
+        for entry in old["entries"].values():
+            drop_stacks(entry["models"].values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": {d: v["bytes"] for d, v in self._entries.items()},
+                "bytes": self.used(),
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+response_compression.py
+
+gzip / brotli negotiation for the JSON responses.
+
+Bodies above COMPRESS_MIN_SIZE bytes (default 1024) are compressed with
+the best encoding the client accepts: brotli when the optional `brotli`
+package is installed, gzip otherwise. Small bodies (single forecasts,
+errors) are sent as-is, compressing them costs more than it saves.
+
+  enable_compression(app)   # after_request hook for a Flask app
+"""
+
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(size):
+    """Encoding to use for a body of `size` bytes, or None."""
+    if size < MIN_SIZE:
+        return None
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0: identical input gives identical bytes (stable ETags)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encode_response(resp, body, encoding):
+    """Set an already compressed body on `resp`."""
+    resp.set_data(body)
+    resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+# ============================================================
+# FLASK HOOK
+# ============================================================
+
+def compress_response(resp):
+    if (resp.status_code != 200 or resp.direct_passthrough
+            or resp.is_streamed or "Content-Encoding" in resp.headers
+            or resp.mimetype != "application/json"):
+        return resp
+
+    body = resp.get_data()
+    if len(body) >= MIN_SIZE:
+        resp.vary.add("Accept-Encoding")
+
+    encoding = negotiate_encoding(len(body))
+    if encoding is None:
+        return resp
+    return encode_response(resp, compress(body, encoding), encoding)
+
+
+def enable_compression(app):
+    app.after_request(compress_response)
+    return app
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+serve.py
+
+Production entry point for the unified backend (server.py): a pre-fork,
+multi-process WSGI runner.
+
+The parent process imports server.py, maps every served model pack,
+parses the datasets and results documents and runs one forecast per
+domain (the same work as /warmup). It then calls gc.freeze() so those
+objects are moved out of the collector's reach: the forked workers never
+touch their reference headers during a collection and the pages stay
+shared copy-on-write instead of being duplicated once per worker.
+
+Every worker accepts on the same listening socket(s). With --legacy the
+old per-domain servers' ports (domain_registry.py: gender 5000, age
+5002, education 5004, civil 5003) are bound as well and routed to their
+legacy routes, so every dashboard runs from this one process tree
+instead of one process (and one copy of the packs) per server. BLAS / OpenMP pools
+are capped per worker (BLAS_THREADS, default 1) before numpy is imported
+so N workers do not start N x cores threads. The parent restarts workers
+that die and forwards SIGTERM / SIGINT for a clean shutdown: a worker
+stops accepting and exits once its request in flight is answered.
+
+Each worker runs server.py's model watcher (MODEL_WATCH_INTERVAL): a
+retrained pack is validated and swapped in without a restart.
+
+Usage:
+  python serve.py                          # one worker per core, port 5001
+  python serve.py --workers 4 --port 5001
+  python serve.py --legacy                 # + the legacy servers' ports
+  WORKERS=4 BLAS_THREADS=1 python serve.py
+
+Throughput benchmark: see bench_throughput.py
+"""
+
+import argparse
+import os
+
+BLAS_ENV = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS"
+]
+
+
+def cap_blas_threads(n):
+    """Must run before numpy is imported (the pools size themselves then)."""
+    for var in BLAS_ENV:
+        os.environ.setdefault(var, str(n))
+
+
+cap_blas_threads(int(os.environ.get("BLAS_THREADS", 1)))
+
+import gc
+import signal
+import sys
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+# ============================================================
+# PARENT: load everything once, before fork
+# ============================================================
+
+def preload():
+    """Import the app and warm every served domain; returns the server module."""
+    gc.disable()
+    start = time.perf_counter()
+
+    import server
+    report = server.warm_up()
+
+    # keep the loaded objects out of the collector: shared pages stay shared
+    gc.freeze()
+
+    ms = (time.perf_counter() - start) * 1000
+    print(f"✅ Preloaded {', '.join(report)} in {ms:.0f} ms "
+          f"({gc.get_freeze_count()} objects frozen)")
+    return server
+
+
+def listeners(server, port, legacy=False):
+    """(port, WSGI app) pairs: the unified app, then each legacy server."""
+    apps = [(port, server.app)]
+    if legacy:
+        for domain in server.LEGACY:
+            if server.MODELS.is_served(domain):
+                apps.append((server.DOMAINS[domain]["legacy"]["port"], server.legacy_app(domain)))
+    return apps
+
+# ============================================================
+# WORKERS
+# ============================================================
+
+def drain(servers):
+    """
+    SIGTERM handler: stop accepting and let serve_forever() return once the
+    request in flight is answered. shutdown() blocks until then, and the
+    signal interrupts the main thread's serve_forever(), hence the threads.
+    """
+    for srv in servers:
+        threading.Thread(target=srv.shutdown, daemon=True).start()
+
+
+def run_worker(servers, watcher):
+    gc.enable()
+    signal.signal(signal.SIGTERM, lambda *_: drain(servers))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent handles ^C
+    watcher.start()  # threads do not survive fork(): one per worker
+    try:
+        threads = [threading.Thread(target=srv.serve_forever, daemon=True)
+                   for srv in servers[1:]]
+        for t in threads:
+            t.start()
+        servers[0].serve_forever()
+        for t in threads:
+            t.join()
+    finally:
+        os._exit(0)
+
+
+def spawn(servers, watcher):
+    pid = os.fork()
+    if pid == 0:
+        run_worker(servers, watcher)
+    return pid
+
+
+def serve(apps, host, workers, watcher):
+    servers = []
+    for port, app in apps:
+        srv = make_server(host, port, app)
+        srv.socket.listen(1024)
+        servers.append(srv)
+
+    children = {spawn(servers, watcher) for _ in range(workers)}
+    ports = ", ".join(str(port) for port, _ in apps)
+    print(f"🚀 {workers} worker(s) serving on http://{host} ports {ports}")
+
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited ({status}), restarting")
+            children.add(spawn(servers, watcher))
+
+    for srv in servers:
+        srv.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 5001)))
+    parser.add_argument("--workers", type=int,
+                        default=int(os.environ.get("WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--legacy", action="store_true",
+                        default=os.environ.get("LEGACY") == "1",
+                        help="also serve the legacy per-domain servers on their ports")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py needs os.fork(); use `python server.py` on this platform")
+
+    server = preload()
+    serve(listeners(server, args.port, args.legacy), args.host, max(1, args.workers),
+          server.WATCHER)
+
+
+if __name__ == "__main__":
+    main()
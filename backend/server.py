@@ -3,81 +3,77 @@
 UNIFIED FLASK BACKEND
 (All predictors merged into 1 server)
 PORT = 5001
+
+Domains (packs, datasets, transforms) are declared in domain_registry.py.
+The routes of the old per-domain servers are served from the same state
+under /legacy/<domain>/ and, with `python serve.py --legacy`, at their
+old ports (see LEGACY SERVERS).
 """
 
-from flask import Flask, request, jsonify
+from functools import partial
+
+from flask import Blueprint, Flask, Response, g, has_request_context, request, jsonify
 from flask_cors import CORS
-import pickle
 import numpy as np
-import pandas as pd
-import json
 import os
+import threading
+import time
+
+import forecast_engine as engine
+from backtest import backtest
+from forecast_cache import ForecastCache, file_fingerprint, forecast_key
+from forecast_export import FORMATS, available_formats, chunk_columns, stream_table
+from forecast_intervals import (IntervalError, ResidualsMissing, load_residuals,
+                                parse_intervals, quantile_bands, simulate)
+from model_registry import (DOMAINS, ArchitectureRegistry, ArchitecturesTooLarge,
+                            DomainNotServed, ModelRegistry, build_entry, pack_version)
+from dataset_store import DatasetStore
+from domain_registry import legacy_domains
+from json_documents import JsonDocuments
+from response_compression import enable_compression
+from werkzeug.serving import run_simple
+from werkzeug.test import Client
 
 app = Flask(__name__)
 CORS(app)
+enable_compression(app)
 
 # =====================================================================
-# DIRECTORY MAPPINGS
-# =====================================================================
-DIR_GENDER = "public/models"
-DIR_AGE = "public/models_age"
-DIR_EDU = "public/models_education"
-DIR_EMI = "public/models_emigrants"
-
-# =====================================================================
-# LOAD MODELS
+# MODEL REGISTRY (packs load lazily, per domain)
 # =====================================================================
+# SERVE_DOMAINS=age,civil restricts which dashboards this process serves
 
-def load_pack(directory):
-    with open(f"{directory}/best_model.json", "r") as f:
-        best = json.load(f)["best"]
-    with open(f"{directory}/{best}.pkl", "rb") as f:
-        pack = pickle.load(f)
-    return best, pack
-
-# GENDER
-best_gender, pack_gender = load_pack(DIR_GENDER)
-male_model = pack_gender["male_model"]
-female_model = pack_gender["female_model"]
-scaler_male = pack_gender["scaler_male"]
-scaler_female = pack_gender["scaler_female"]
-WINDOW_G = pack_gender["window"]
+MODELS = ModelRegistry()
 
-# AGE
-best_age, pack_age = load_pack(DIR_AGE)
-models_age = pack_age["models"]
-scalers_age = pack_age["scalers"]
-WINDOW_A = pack_age["window"]
-CATEGORIES_AGE = pack_age["categories"]
 
-# EDUCATION
-best_edu, pack_edu = load_pack(DIR_EDU)
-models_edu = pack_edu["models"]
-scalers_edu = pack_edu["scalers"]
-WINDOW_E = pack_edu["window"]
-CATEGORIES_EDU = pack_edu["categories"]
+def model_entry(domain):
+    """
+    The domain's entry, pinned for the rest of the request: a hot reload
+    (see HOT MODEL RELOAD) swaps MODELS entries, but a request already
+    running keeps using the version it started with.
+    """
+    if not has_request_context():
+        return MODELS.get(domain)
+    pinned = g.setdefault("models", {})
+    if domain not in pinned:
+        pinned[domain] = MODELS.get(domain)
+    return pinned[domain]
 
-# EMIGRANTS (CIVIL STATUS)
-best_emi, pack_emi = load_pack(DIR_EMI)
-models_emi = pack_emi["models"]
-scalers_emi = pack_emi["scalers"]
-WINDOW_C = pack_emi["window"]
-CATEGORIES_CIVIL = pack_emi["categories"]
-tiny_categories = pack_emi.get("tiny_categories", ["notReported"])
+# every architecture (mlp1/mlp2/mlp3) for /compare, within COMPARE_MAX_MB
+# (the engine's stack cache is outside that cap: /cache-stats "stacks")
+ARCHITECTURES = ArchitectureRegistry(MODELS.domains)
 
 # =====================================================================
-# LOAD RESULTS + EXPLANATION
+# LOAD DATASETS (parsed once, reloaded when the CSV changes)
 # =====================================================================
 
-with open(f"{DIR_AGE}/results.json", "r") as f:
-    results_age = json.load(f)
+DATASETS = DatasetStore()
+for _domain in MODELS.domains:
+    DATASETS.register(_domain, DOMAINS[_domain]["dataset"], derive=DOMAINS[_domain]["derive"])
 
-with open(f"{DIR_EMI}/results.json", "r") as f:
-    results_emi = json.load(f)
-
-# ⭐ Ensure civil results has `best_model` in case only `best` is stored
-if "best_model" not in results_emi and "best" in results_emi:
-    results_emi["best_model"] = results_emi["best"]
+# =====================================================================
+# RESULTS + EXPLANATION (pre-serialized, rebuilt when results.json changes)
+# =====================================================================
 
 EXPLANATION = {
     "title": "Why this model was selected",
@@ -89,42 +85,260 @@ EXPLANATION = {
     ]
 }
 
+
+def with_best_model(raw):
+    # ⭐ Ensure civil results has `best_model` in case only `best` is stored
+    if "best_model" not in raw and "best" in raw:
+        raw["best_model"] = raw["best"]
+    return raw
+
+
+def modal_payload(raw):
+    """Members embedded in single-category responses for the MLP modal."""
+    return {
+        "explanation": EXPLANATION,
+        "allModelResults": raw,
+        "best_model": raw["best_model"]
+    }
+
+
+def results_path(domain):
+    return f"{DOMAINS[domain]['directory']}/results.json"
+
+
+# only the served domains: the others may not even have a model directory
+DOCS = JsonDocuments()
+for _domain in MODELS.domains:
+    DOCS.register(f"results_{_domain}", results_path(_domain), build=with_best_model)
+if MODELS.is_served("age"):
+    DOCS.register("modal_age", results_path("age"), build=modal_payload)
+if MODELS.is_served("civil"):
+    DOCS.register("modal_civil", results_path("civil"),
+                  build=lambda raw: modal_payload(with_best_model(raw)))
+
+
+def domain_document(domain, kind):
+    """Response of the document `<kind>_<domain>` (404 if the domain is not served)."""
+    if not MODELS.is_served(domain):
+        raise DomainNotServed(domain)
+    return DOCS.response(f"{kind}_{domain}")
+
 # =====================================================================
 # FORECAST HELPERS
 # =====================================================================
 
-def mlp_forecast(model, scaler, last_vals, steps, window):
-    preds = []
-    cur = last_vals.copy()
+def load_series(domain):
+    """(last year, {category: raw yearly values}) for a domain's dataset."""
+    return DOMAINS[domain]["series"](DATASETS.get(domain))
+
+
+def prepare_window(m, category, values):
+    """Scaled last `window` values (sqrt first for tiny categories)."""
+    vals = values.reshape(-1, 1)
+    if category in m["tiny_categories"]:
+        vals = np.sqrt(vals)
+    return m["scalers"][category].transform(vals)[-m["window"]:]
+
+
+def run_forecast(m, series, categories, steps=10):
+    """
+    Forecast `categories` of one domain pack. A single category runs the
+    exact per-category recursion; several run as one batched recursion.
+    Civil status clamps to >= 0 and squares back the tiny categories.
+    """
+    last = [prepare_window(m, c, series[c]) for c in categories]
+    square = [c in m["tiny_categories"] for c in categories]
+
+    if len(categories) == 1:
+        c = categories[0]
+        preds = [engine.forecast(m["models"][c], m["scalers"][c], last[0],
+                                 steps, m["window"],
+                                 clamp=m["clamp"], square=square[0])]
+    else:
+        preds = engine.forecast_batch(
+            [m["models"][c] for c in categories],
+            [m["scalers"][c] for c in categories],
+            last, steps, m["window"],
+            clamp=m["clamp"], square=square
+        )
+    return dict(zip(categories, preds))
+
+# =====================================================================
+# FORECAST CACHE
+# =====================================================================
+# keyed on (domain, category, horizon, model, pack + csv fingerprints)
+# concurrent misses on one key share a single computation (single-flight);
+# /cache-stats reports computations, coalesced and coalescing_ratio
+
+FORECAST_CACHE = ForecastCache(
+    max_entries=int(os.environ.get("FORECAST_CACHE_SIZE", 256)),
+    ttl=float(os.environ.get("FORECAST_CACHE_TTL", 3600))
+)
+
+def domain_forecast(domain, category=None, steps=10, m=None):
+    """
+    Cached forecast for one category (or every category when None) of the
+    best pack (or of the entry `m`).
+    Returns (model entry, future years, {category: forecast}).
+    """
+    if m is None:
+        m = model_entry(domain)
+    categories = m["categories"] if category is None else [category]
+
+    def compute():
+        last_year, series = load_series(domain)
+        years = list(range(last_year + 1, last_year + steps + 1))
+        return years, run_forecast(m, series, categories, steps)
+
+    key = forecast_key(domain, category or "*", steps, m["name"],
+                       m["version"], DATASETS.path(domain))
+    years, preds = FORECAST_CACHE.get_or_compute(key, compute)
+    return m, years, preds
+
+
+@app.errorhandler(DomainNotServed)
+def domain_not_served(e):
+    return jsonify({"error": f"domain {e.args[0]} is not served by this process"}), 404
+
+# =====================================================================
+# PREDICTION INTERVALS (?intervals=80,95&paths=5000 on any forecast)
+# =====================================================================
+# Monte Carlo paths perturbed with the model's validation residuals
+# (residuals.json from train.py); cached like the point forecasts
+
+def domain_intervals(domain, category, steps, levels, paths, m=None):
+    """
+    {"levels", "paths", "bands": {category: median + quantile bands}} of
+    the best pack (or of the architecture entry `m`).
+    """
+    if m is None:
+        m = model_entry(domain)
+    categories = m["categories"] if category is None else [category]
+
+    def compute():
+        residuals = load_residuals(m["directory"], m["name"], categories)
+        _, series = load_series(domain)
+        values = simulate(
+            [m["models"][c] for c in categories],
+            [m["scalers"][c] for c in categories],
+            [prepare_window(m, c, series[c]) for c in categories],
+            [residuals[c] for c in categories],
+            steps, m["window"], paths,
+            clamp=m["clamp"], square=[c in m["tiny_categories"] for c in categories],
+            keys=categories
+        )
+        bands = quantile_bands(values, levels)
+        return {"levels": levels, "paths": paths, "bands": dict(zip(categories, bands))}
+
+    key = forecast_key(domain, ("#intervals", category or "*", tuple(levels), paths), steps,
+                       m["name"], m["version"], DATASETS.path(domain))
+    return FORECAST_CACHE.get_or_compute(key, compute)
+
+
+def add_intervals(body, domain, category=None, steps=10):
+    """Attach the bands to a forecast body when the request asks for them."""
+    requested = parse_intervals(request.args)
+    if requested is not None:
+        body["intervals"] = domain_intervals(domain, category, steps, *requested)
+    return body
+
+
+@app.errorhandler(IntervalError)
+def bad_intervals(e):
+    return jsonify({"error": str(e)}), 400
+
+
+@app.errorhandler(ResidualsMissing)
+def residuals_missing(e):
+    return jsonify({"error": str(e)}), 503
+
+# =====================================================================
+# RESPONSE BODIES (shared by the single routes and /batch)
+# =====================================================================
+
+def gender_body(m, years, preds, gender):
+    return {
+        "gender": gender,
+        "future_years": years,
+        "forecast": preds[gender],
+        "model_used": m["name"]
+    }
+
+
+def age_body(m, years, preds, group):
+    return {
+        "group": group,
+        "future_years": years,
+        "forecast": preds[group],
+        "model_used": m["name"]
+    }
+
+
+def civil_body(m, years, preds, status):
+    return {
+        "status": status,
+        "years": years,
+        "forecast": preds[status],
+        "model_used": m["name"]
+    }
+
+
+def education_body(m, years, preds, category):
+    return {
+        "category": category,
+        "future_years": years,
+        "forecast": preds[category],
+        "model_used": m["name"]
+    }
+
+
+def gender_all_body(m, years, preds):
+    return {
+        "genders": m["categories"],
+        "data": {g: {"years": years, "forecast": preds[g]} for g in m["categories"]},
+        "model_used": m["name"]
+    }
+
+
+def age_all_body(m, years, preds):
+    output = {
+        g: {"years": years, "forecast": preds[g]}
+        for g in m["categories"]
+    }
+
+    return {
+        "groups": m["categories"],
+        "data": output,
+        "best_model": m["name"]
+    }
+
 
-    for _ in range(steps):
-        X = cur[-window:].reshape(1, -1)
-        pred_scaled = model.predict(X)[0]
-        pred = scaler.inverse_transform([[pred_scaled]])[0][0]
-        preds.append(float(pred))
-        cur = np.vstack([cur, [pred_scaled]])
-    return preds
+def education_all_body(m, years, preds):
+    out = {
+        c: [{"year": y, "predicted": float(p)} for y, p in zip(years, preds[c])]
+        for c in m["categories"]
+    }
 
-def civil_forecast(model, scaler, last_vals, steps, window, status):
-    preds = []
-    cur = last_vals.copy()
+    return {
+        "results": out,
+        "model_used": m["name"]
+    }
 
-    for _ in range(steps):
-        X = cur[-window:].reshape(1, -1)
-        pred_scaled = model.predict(X)[0]
-        pred = max(scaler.inverse_transform([[pred_scaled]])[0][0], 0)
 
-        # extra boosting for tiny categories
-        if status in tiny_categories:
-            pred = max(pred**2, 0)
+def civil_all_body(m, years, preds):
+    out = {c: {"years": years, "forecast": preds[c]} for c in m["categories"]}
 
-        preds.append(float(pred))
-        cur = np.vstack([cur, [pred_scaled]])
-    return preds
+    return {
+        "statuses": m["categories"],
+        "data": out,
+        "model_used": m["name"]
+    }
 
 # =====================================================================
 # ROUTER: /predict (gender, age, civil)
 # =====================================================================
+# ?fields=forecast,years (or ?include=) keeps only the listed keys and
+# skips the explanation / allModelResults / best_model modal sections
 
 @app.route("/predict", methods=["GET"])
 def unified_predict():
@@ -135,227 +349,730 @@ def unified_predict():
         if gender not in ["male", "female"]:
             return jsonify({"error": "gender must be male or female"}), 400
 
-        model = male_model if gender == "male" else female_model
-        scaler = scaler_male if gender == "male" else scaler_female
-
-        df = pd.read_csv("gender_yearly.csv")
-        vals = df[gender].values.reshape(-1, 1)
-
-        scaled = scaler.transform(vals)
-        preds = mlp_forecast(model, scaler, scaled[-WINDOW_G:], 10, WINDOW_G)
-
-        years = list(range(int(df["year"].iloc[-1]) + 1,
-                           int(df["year"].iloc[-1]) + 11))
-
-        return jsonify({
-            "gender": gender,
-            "future_years": years,
-            "forecast": preds,
-            "model_used": best_gender
-        })
+        m, years, preds = domain_forecast("gender", gender)
+        return jsonify(add_intervals(gender_body(m, years, preds, gender), "gender", gender))
 
     # ------------------ AGE -------------------
     if "group" in request.args:
         group = request.args.get("group")
-        if group not in CATEGORIES_AGE:
+        if group not in model_entry("age")["categories"]:
             return jsonify({"error": "invalid age group"}), 400
 
-        model = models_age[group]
-        scaler = scalers_age[group]
+        m, years, preds = domain_forecast("age", group)
 
-        df = pd.read_csv("age_yearly.csv")
-        df["ageGroup_clean"] = (
-            df["ageGroup"]
-            .str.replace(" - ", "_")
-            .str.replace("-", "_")
-            .str.replace(" ", "_")
-            .str.lower()
-        )
+        # ⭐ AGE modal payload (explanation, allModelResults, best_model)
+        return DOCS.embed(add_intervals(age_body(m, years, preds, group), "age", group),
+                          "modal_age")
 
-        vals = df[df["ageGroup_clean"] == group]["count"].values.reshape(-1, 1)
-        scaled = scaler.transform(vals)
+    # ------------------ CIVIL STATUS -------------------
+    if "status" in request.args:
+        status = request.args.get("status")
+        if status not in model_entry("civil")["categories"]:
+            return jsonify({"error": f"invalid status"}), 400
 
-        preds = mlp_forecast(model, scaler, scaled[-WINDOW_A:], 10, WINDOW_A)
+        m, years, preds = domain_forecast("civil", status)
 
-        years = list(range(int(df["year"].max()) + 1,
-                           int(df["year"].max()) + 11))
+        # ⭐ CIVIL modal payload (for single-status charts)
+        return DOCS.embed(add_intervals(civil_body(m, years, preds, status), "civil", status),
+                          "modal_civil")
 
-        return jsonify({
-            "group": group,
-            "future_years": years,
-            "forecast": preds,
-            "model_used": best_age,
+    return jsonify({"error": "missing gender/group/status"}), 400
 
-            # ⭐ AGE modal payload
-            "explanation": EXPLANATION,
-            "allModelResults": results_age,
-            "best_model": results_age["best_model"]
-        })
 
-    # ------------------ CIVIL STATUS -------------------
-    if "status" in request.args:
-        status = request.args.get("status")
-        if status not in CATEGORIES_CIVIL:
-            return jsonify({"error": f"invalid status"}), 400
+# =====================================================================
+# GENDER: /predict-gender-all
+# =====================================================================
+
+@app.route("/predict-gender-all", methods=["GET"])
+def gender_predict_all():
+    return jsonify(add_intervals(gender_all_body(*domain_forecast("gender")), "gender"))
 
-        model = models_emi[status]
-        scaler = scalers_emi[status]
 
-        df = pd.read_csv("emigrants_marital_status.csv")
-        vals = df[status].values.reshape(-1, 1)
+# =====================================================================
+# AGE: /predict-all
+# =====================================================================
+
+@app.route("/predict-all", methods=["GET"])
+def age_predict_all():
+    return jsonify(add_intervals(age_all_body(*domain_forecast("age")), "age"))
 
-        if status in tiny_categories:
-            vals = np.sqrt(vals)
 
-        scaled = scaler.transform(vals)
+# =====================================================================
+# EDUCATION ENDPOINTS
+# =====================================================================
 
-        preds = civil_forecast(model, scaler, scaled[-WINDOW_C:], 10, WINDOW_C, status)
+@app.route("/predict-education")
+def predict_education():
+    category = request.args.get("category")
 
-        years = list(range(int(df["year"].max()) + 1,
-                           int(df["year"].max()) + 11))
+    if category not in model_entry("education")["categories"]:
+        return jsonify({"error": f"Invalid category"}), 400
 
-        return jsonify({
-            "status": status,
-            "years": years,
-            "forecast": preds,
-            "model_used": best_emi,
+    m, years, preds = domain_forecast("education", category)
+    return jsonify(add_intervals(education_body(m, years, preds, category),
+                                 "education", category))
 
-            # ⭐ CIVIL modal payload (for single-status charts)
-            "explanation": EXPLANATION,
-            "allModelResults": results_emi,
-            "best_model": results_emi["best_model"]
-        })
 
-    return jsonify({"error": "missing gender/group/status"}), 400
+@app.route("/predict-education-all")
+def predict_education_all():
+    return jsonify(add_intervals(education_all_body(*domain_forecast("education")),
+                                 "education"))
 
 
 # =====================================================================
-# AGE: /predict-all
+# CIVIL STATUS: /civil-predict-all
 # =====================================================================
 
-@app.route("/predict-all", methods=["GET"])
-def age_predict_all():
-    df = pd.read_csv("age_yearly.csv")
-    df["ageGroup_clean"] = (
-        df["ageGroup"]
-        .str.replace(" - ", "_")
-        .str.replace("-", "_")
-        .str.replace(" ", "_")
-        .str.lower()
-    )
+@app.route("/civil-predict-all")
+def civil_predict_all():
+    # ⭐ CIVIL: for the big MLP comparison modal
+    return DOCS.embed(add_intervals(civil_all_body(*domain_forecast("civil")), "civil"),
+                      "modal_civil")
+
+
+# =====================================================================
+# BATCH: /batch (one round trip for a whole dashboard load)
+# =====================================================================
+# POST {"queries": [{"gender": "male"}, {"group": "15_19"},
+#                   {"status": "all", "fields": ["data", "statuses"]},
+#                   {"education": "college"}, {"results": "civil"}]}
+# GET  /batch?q=gender:male&q=group:15_19&q=results:civil
+#
+# Each query returns the body of its single route ("all" = the *-all
+# route), in request order; a bad query gets {"error": ...} in its slot.
+# Every domain touched is forecast once for all its categories (one
+# batched, cached recursion), so all queries of a domain share the same
+# dataset snapshot and model version.
+
+BATCH_QUERIES = {
+    "gender": {"domain": "gender", "one": gender_body, "all": gender_all_body},
+    "group": {"domain": "age", "one": age_body, "all": age_all_body,
+              "modal_one": "modal_age"},
+    "status": {"domain": "civil", "one": civil_body, "all": civil_all_body,
+               "modal_one": "modal_civil", "modal_all": "modal_civil"},
+    "education": {"domain": "education", "one": education_body, "all": education_all_body}
+}
+RESULTS_KINDS = list(DOMAINS)
+MAX_BATCH = 64
+
+
+def parse_batch():
+    """List of query dicts from the JSON body or ?q=kind:value."""
+    if request.method == "POST":
+        body = request.get_json(silent=True)
+        queries = body.get("queries") if isinstance(body, dict) else body
+    else:
+        queries = []
+        for q in request.args.getlist("q"):
+            kind, _, value = q.partition(":")
+            queries.append({kind: value})
+
+    if not isinstance(queries, list) or not queries:
+        raise ValueError("expected a non-empty list of queries")
+    if len(queries) > MAX_BATCH:
+        raise ValueError(f"at most {MAX_BATCH} queries per batch")
+    return queries
+
+
+def batch_fields(query):
+    """Keys to keep: a list of names or a comma separated string (None = all)."""
+    fields = query.get("fields")
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+        raise ValueError("fields must be a list of key names")
+    return {f.strip() for f in fields if f.strip()}
+
+
+def batch_item(query, forecasts):
+    if not isinstance(query, dict):
+        return {"error": "query must be an object"}
+
+    try:
+        fields = batch_fields(query)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    kinds = [k for k in query if k in BATCH_QUERIES or k == "results"]
+    if len(kinds) != 1:
+        return {"error": f"query needs exactly one of {list(BATCH_QUERIES) + ['results']}"}
+    kind = kinds[0]
+    value = query[kind]
+
+    if kind == "results":
+        if value not in RESULTS_KINDS:
+            return {"error": f"results must be one of {RESULTS_KINDS}"}
+        if not MODELS.is_served(value):
+            return {"error": f"domain {value} is not served by this process"}
+        return DOCS.data(f"results_{value}")
+
+    spec = BATCH_QUERIES[kind]
+    domain = spec["domain"]
+    try:
+        if domain not in forecasts:
+            forecasts[domain] = domain_forecast(domain)
+    except DomainNotServed:
+        return {"error": f"domain {domain} is not served by this process"}
+    m, years, preds = forecasts[domain]
+
+    if value == "all":
+        body, modal = spec["all"](m, years, preds), spec.get("modal_all")
+    elif value in m["categories"]:
+        body, modal = spec["one"](m, years, preds, value), spec.get("modal_one")
+    else:
+        return {"error": f"invalid {kind}: {value}"}
+
+    if modal is not None:
+        body.update(DOCS.data(modal))
+
+    if fields is not None:
+        body = {k: v for k, v in body.items() if k in fields}
+    return body
+
+
+@app.route("/batch", methods=["GET", "POST"])
+def batch():
+    try:
+        queries = parse_batch()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    forecasts = {}  # domain -> (model entry, years, preds), one snapshot each
+    return jsonify({"results": [batch_item(q, forecasts) for q in queries]})
 
-    future_years = list(range(int(df["year"].max()) + 1,
-                              int(df["year"].max()) + 11))
 
-    output = {}
-    for group in CATEGORIES_AGE:
-        model = models_age[group]
-        scaler = scalers_age[group]
+# =====================================================================
+# BACKTEST: /backtest?domain=age&steps=10
+# =====================================================================
+# recursive forecasts from every historical origin, scored per horizon
+# (mae / rmse / smape / n); cached like forecasts, on the pack + csv
+# fingerprints, so it is recomputed only after retraining or new data
 
-        vals = df[df["ageGroup_clean"] == group]["count"].values.reshape(-1, 1)
-        scaled = scaler.transform(vals)
+MAX_BACKTEST_STEPS = 30
 
-        preds = mlp_forecast(model, scaler, scaled[-WINDOW_A:], 10, WINDOW_A)
 
-        output[group] = {"years": future_years, "forecast": preds}
+def steps_arg(default=10):
+    """?steps= as an int in 1-MAX_BACKTEST_STEPS, or raise ValueError."""
+    value = request.args.get("steps")
+    if value is None:
+        return default
+    try:
+        steps = int(value)
+    except ValueError:
+        raise ValueError("steps must be an integer")
+    if not 1 <= steps <= MAX_BACKTEST_STEPS:
+        raise ValueError(f"steps must be 1-{MAX_BACKTEST_STEPS}")
+    return steps
 
-    return jsonify({
-        "groups": CATEGORIES_AGE,
-        "data": output,
-        "best_model": best_age
-    })
+
+@app.route("/backtest", methods=["GET"])
+def backtest_domain():
+    domain = request.args.get("domain")
+    if domain not in DOMAINS:
+        return jsonify({"error": f"domain must be one of {list(DOMAINS)}"}), 400
+
+    try:
+        steps = steps_arg()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    m = model_entry(domain)
+
+    def compute():
+        last_year, series = load_series(domain)
+        return backtest(m, series, last_year, steps)
+
+    key = forecast_key(domain, "#backtest", steps, m["name"],
+                       m["version"], DATASETS.path(domain))
+    return jsonify(FORECAST_CACHE.get_or_compute(key, compute))
 
 
 # =====================================================================
-# EDUCATION ENDPOINTS
+# MODEL COMPARISON: /compare?domain=age[&category=25_29][&ensemble=mean]
 # =====================================================================
+# forecasts of every trained architecture side by side (the MLP modals
+# show their metrics from results.json), plus an optional mean ensemble;
+# all architectures x categories run as one batched recursion
+
+def compare_forecast(domain, category, steps, packs=None):
+    if packs is None:
+        packs = ARCHITECTURES.get(domain)["entries"]
+    first = next(iter(packs.values()))
+    categories = first["categories"] if category is None else [category]
+
+    def compute():
+        last_year, series = load_series(domain)
+        cells = [(name, c) for name in packs for c in categories]
+        entries = [packs[name] for name, _ in cells]
+
+        preds = {}
+        for window in {e["window"] for e in entries}:  # one batch per window length
+            rows = [i for i, e in enumerate(entries) if e["window"] == window]
+            out = engine.forecast_batch(
+                [entries[i]["models"][cells[i][1]] for i in rows],
+                [entries[i]["scalers"][cells[i][1]] for i in rows],
+                [prepare_window(entries[i], cells[i][1], series[cells[i][1]]) for i in rows],
+                steps, window,
+                clamp=first["clamp"],
+                square=[cells[i][1] in entries[i]["tiny_categories"] for i in rows]
+            )
+            preds.update((cells[i], p) for i, p in zip(rows, out))
+
+        years = list(range(last_year + 1, last_year + steps + 1))
+        return years, {c: {name: preds[(name, c)] for name in packs} for c in categories}
+
+    key = (domain, "#compare", category or "*", steps, first["version"],
+           file_fingerprint(DATASETS.path(domain)))
+    return list(packs), FORECAST_CACHE.get_or_compute(key, compute)
+
+
+@app.route("/compare", methods=["GET"])
+def compare():
+    domain = request.args.get("domain")
+    if domain not in DOMAINS:
+        return jsonify({"error": f"domain must be one of {list(DOMAINS)}"}), 400
 
-@app.route("/predict-education")
-def predict_education():
     category = request.args.get("category")
+    if category is not None and category not in model_entry(domain)["categories"]:
+        return jsonify({"error": f"invalid category for {domain}"}), 400
 
-    if category not in CATEGORIES_EDU:
-        return jsonify({"error": f"Invalid category"}), 400
-
-    model = models_edu[category]
-    scaler = scalers_edu[category]
+    try:
+        steps = steps_arg()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    df = pd.read_csv("education_yearly.csv")
-    vals = df[category].values.reshape(-1, 1)
-    scaled = scaler.transform(vals)
+    ensemble = request.args.get("ensemble")
+    if ensemble not in (None, "mean"):
+        return jsonify({"error": "ensemble must be mean"}), 400
 
-    preds = mlp_forecast(model, scaler, scaled[-WINDOW_E:], 10, WINDOW_E)
+    try:
+        names, (years, forecasts) = compare_forecast(domain, category, steps)
+    except ArchitecturesTooLarge as e:
+        return jsonify({"error": str(e)}), 503
 
-    years = list(range(int(df["year"].max()) + 1,
-                       int(df["year"].max()) + 11))
+    data = {}
+    for c, per_model in forecasts.items():
+        data[c] = dict(per_model)
+        if ensemble:
+            data[c]["ensemble"] = np.mean([per_model[n] for n in names], axis=0).tolist()
 
     return jsonify({
-        "category": category,
+        "domain": domain,
+        "models": names,
+        "best_model": model_entry(domain)["name"],
+        "ensemble": ensemble,
         "future_years": years,
-        "forecast": preds,
-        "model_used": best_edu
+        "data": data
     })
 
 
-@app.route("/predict-education-all")
-def predict_education_all():
-    df = pd.read_csv("education_yearly.csv")
-    years = list(range(int(df["year"].max()) + 1,
-                       int(df["year"].max()) + 11))
-
-    out = {}
-    for c in CATEGORIES_EDU:
-        model = models_edu[c]
-        scaler = scalers_edu[c]
-
-        vals = df[c].values.reshape(-1, 1)
-        scaled = scaler.transform(vals)
+# =====================================================================
+# BULK EXPORT: /export?format=csv&domains=age,civil&models=all
+# =====================================================================
+# one long-format table (domain, category, model, best, year, value
+# [, median, lower_L, upper_L with ?intervals=]) streamed per (domain,
+# model) chunk; csv always, arrow / parquet with the optional pyarrow.
+# Same table as `python forecast_export.py`.
+
+def export_plan(domains, models="all", intervals=None):
+    """
+    [(domain, best entry, {name: entry})] pinned before streaming starts:
+    the chunks are computed after the response has begun (and after the
+    request context is gone), so packs and residuals are loaded here,
+    where ArchitecturesTooLarge / ResidualsMissing can still become a
+    503, and a hot reload mid-export cannot mix model versions.
+    """
+    plan = []
+    for domain in domains:
+        best = model_entry(domain)
+        entries = ARCHITECTURES.get(domain)["entries"] if models == "all" \
+            else {best["name"]: best}
+
+        if intervals:
+            for m in entries.values():
+                load_residuals(m["directory"], m["name"], m["categories"])
+        plan.append((domain, best, entries))
+    return plan
+
+
+def export_chunks(plan, models="all", steps=10, intervals=None):
+    """Long-format columns per (domain, model) of an export_plan, one at a time."""
+    levels = intervals[0] if intervals else None
+    for domain, best, entries in plan:
+        if models == "all":
+            names, (years, forecasts) = compare_forecast(domain, None, steps, entries)
+        else:
+            _, years, preds = domain_forecast(domain, steps=steps, m=best)
+            names = [best["name"]]
+            forecasts = {c: {best["name"]: p} for c, p in preds.items()}
+
+        for name in names:
+            bands = None
+            if intervals:
+                bands = domain_intervals(domain, None, steps, *intervals, m=entries[name])["bands"]
+            yield chunk_columns(domain, name, best["name"], years,
+                                {c: forecasts[c][name] for c in forecasts}, bands, levels)
+
+
+@app.route("/export", methods=["GET"])
+def export():
+    fmt = request.args.get("format", "csv")
+    if fmt not in available_formats():
+        return jsonify({"error": f"format must be one of {available_formats()}"}), 400
+
+    domains = [d for d in request.args.get("domains", "").split(",") if d] or MODELS.domains
+    unknown = [d for d in domains if not MODELS.is_served(d)]
+    if unknown:
+        return jsonify({"error": f"domains not served: {unknown}"}), 400
+
+    models = request.args.get("models", "all")
+    if models not in ("all", "best"):
+        return jsonify({"error": "models must be all or best"}), 400
+
+    try:
+        steps = steps_arg()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    intervals = parse_intervals(request.args)
+    levels = intervals[0] if intervals else None
+
+    try:
+        plan = export_plan(domains, models, intervals)
+    except ArchitecturesTooLarge as e:
+        return jsonify({"error": str(e)}), 503
+
+    spec = FORMATS[fmt]
+    chunks = export_chunks(plan, models, steps, intervals)
+    return Response(stream_table(chunks, fmt, levels), mimetype=spec["mimetype"], headers={
+        "Content-Disposition": f"attachment; filename=forecasts.{spec['extension']}"
+    })
 
-        preds = mlp_forecast(model, scaler, scaled[-WINDOW_E:], 10, WINDOW_E)
 
-        out[c] = [{"year": y, "predicted": float(p)} for y, p in zip(years, preds)]
+# =====================================================================
+# SCENARIOS: /scenario (what-if forecasts over edited history)
+# =====================================================================
+# POST {"domain": "civil", "category": "single", "steps": 10,
+#       "scenarios": [{"name": "2019 -20%", "overrides": {"2019": {"scale": 0.8}}},
+#                     {"overrides": {"2020": 61000, "2019": {"delta": -500}}}]}
+#
+# An override replaces a historical value: a number, or {"value": v},
+# {"scale": f}, {"delta": d} relative to the actual value. The pack's
+# scalers (and sqrt for tiny categories) are applied as they are, not
+# refit, so only overrides inside `window_years` change the forecast.
+# Every scenario (plus the unmodified baseline) runs in one batched
+# recursion.
+
+MAX_SCENARIOS = 1000
+
+
+def apply_override(actual, spec):
+    if isinstance(spec, dict):
+        if len(spec) != 1:
+            raise ValueError("override must have exactly one of value/scale/delta")
+        (kind, x), = spec.items()
+        if kind not in ("value", "scale", "delta") or isinstance(x, bool) or \
+                not isinstance(x, (int, float)):
+            raise ValueError(f"bad override {spec}")
+        return {"value": x, "scale": actual * x, "delta": actual + x}[kind]
+
+    if isinstance(spec, bool) or not isinstance(spec, (int, float)):
+        raise ValueError(f"bad override {spec!r}")
+    return spec
+
+
+def scenario_histories(body, values, first_year):
+    """(names, normalized overrides, (S, years) histories) of the request."""
+    scenarios = body.get("scenarios")
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("expected a non-empty list of scenarios")
+    if len(scenarios) > MAX_SCENARIOS:
+        raise ValueError(f"at most {MAX_SCENARIOS} scenarios per request")
+
+    names, applied = [], []
+    histories = np.tile(values, (len(scenarios), 1))
+    for i, scenario in enumerate(scenarios):
+        overrides = scenario.get("overrides") if isinstance(scenario, dict) else None
+        if not isinstance(overrides, dict):
+            raise ValueError(f"scenario {i}: overrides must be an object")
+
+        done = {}
+        for year, spec in overrides.items():
+            try:
+                pos = int(year) - first_year
+            except ValueError:
+                raise ValueError(f"scenario {i}: bad year {year!r}")
+            if not 0 <= pos < len(values):
+                raise ValueError(f"scenario {i}: no history for {year}")
+
+            try:
+                value = float(apply_override(values[pos], spec))
+            except ValueError as e:
+                raise ValueError(f"scenario {i}: {e}")
+            except OverflowError:
+                raise ValueError(f"scenario {i}: override of {year} is out of range")
+            if not np.isfinite(value) or value < 0:
+                raise ValueError(f"scenario {i}: {year} must be a count >= 0")
+            histories[i, pos] = done[int(year)] = value
+
+        names.append(str(scenario.get("name", f"scenario {i + 1}")))
+        applied.append(done)
+    return names, applied, histories
+
+
+@app.route("/scenario", methods=["POST"])
+def scenario():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"error": "expected a JSON object"}), 400
+
+    domain, category = body.get("domain"), body.get("category")
+    if not isinstance(domain, str) or domain not in DOMAINS:
+        return jsonify({"error": f"domain must be one of {list(DOMAINS)}"}), 400
+    m = model_entry(domain)
+    if not isinstance(category, str) or category not in m["categories"]:
+        return jsonify({"error": f"category must be one of {m['categories']}"}), 400
+
+    steps = body.get("steps", 10)
+    if isinstance(steps, bool) or not isinstance(steps, int) or \
+            not 1 <= steps <= MAX_BACKTEST_STEPS:
+        return jsonify({"error": f"steps must be 1-{MAX_BACKTEST_STEPS}"}), 400
+
+    last_year, series = load_series(domain)
+    values = np.asarray(series[category], dtype=np.float64)
+    first_year = last_year - len(values) + 1
+    try:
+        names, applied, histories = scenario_histories(body, values, first_year)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # baseline first, then every scenario: (1, 1 + S, window) scaled windows
+    window = m["window"]
+    tail = np.vstack([values, histories])[:, -window:]
+    tiny = category in m["tiny_categories"]
+    if tiny:
+        tail = np.sqrt(tail)
+    scaler = m["scalers"][category]
+    windows = (tail * scaler.scale_[0] + scaler.min_[0])[None]
+
+    scaled = engine.forecast_scaled_paths([m["models"][category]], windows, steps)
+    preds = engine.to_values(scaled, [scaler], m["clamp"], [tiny])[0].tolist()
 
     return jsonify({
-        "results": out,
-        "model_used": best_edu
+        "domain": domain,
+        "category": category,
+        "model_used": m["name"],
+        "future_years": list(range(last_year + 1, last_year + steps + 1)),
+        "window_years": list(range(last_year - window + 1, last_year + 1)),
+        "baseline": preds[0],
+        "scenarios": [
+            {"name": n, "overrides": o, "forecast": p}
+            for n, o, p in zip(names, applied, preds[1:])
+        ]
     })
 
 
 # =====================================================================
-# CIVIL STATUS: /civil-predict-all
+# FORECAST CACHE STATS
 # =====================================================================
 
-@app.route("/civil-predict-all")
-def civil_predict_all():
-    df = pd.read_csv("emigrants_marital_status.csv")
-    years = list(range(int(df["year"].max()) + 1,
-                       int(df["year"].max()) + 11))
+@app.route("/cache-stats", methods=["GET"])
+def cache_stats():
+    return jsonify({**FORECAST_CACHE.stats(), "architectures": ARCHITECTURES.stats(),
+                    "stacks": engine.stack_stats()})
 
-    out = {}
-    for c in CATEGORIES_CIVIL:
-        model = models_emi[c]
-        scaler = scalers_emi[c]
 
-        vals = df[c].values.reshape(-1, 1)
-        if c in tiny_categories:
-            vals = np.sqrt(vals)
+# =====================================================================
+# WARM-UP + READINESS (for the load balancer)
+# =====================================================================
 
-        scaled = scaler.transform(vals)
+def warm_up():
+    """Load every served domain's pack and run one forecast through it."""
+    report = {}
+    for domain in MODELS.domains:
+        start = time.perf_counter()
+        m = MODELS.get(domain)
+        _, series = load_series(domain)
+        run_forecast(m, series, m["categories"])
+        MODELS.mark_warm(domain)
 
-        preds = civil_forecast(model, scaler, scaled[-WINDOW_C:], 10, WINDOW_C, c)
+        report[domain] = {
+            "model": m["name"],
+            "categories": len(m["categories"]),
+            "ms": round((time.perf_counter() - start) * 1000, 2)
+        }
 
-        out[c] = {"years": years, "forecast": preds}
+    DOCS.preload()
+    return report
 
-    return jsonify({
-        "statuses": CATEGORIES_CIVIL,
-        "data": out,
-        "model_used": best_emi,
 
-        # ⭐ CIVIL: for the big MLP comparison modal
-        "explanation": EXPLANATION,
-        "allModelResults": results_emi,
-        "best_model": results_emi["best_model"]
-    })
+@app.route("/warmup", methods=["GET", "POST"])
+def warmup():
+    report = warm_up()
+    return jsonify({"ready": MODELS.is_ready(), "domains": report})
+
+
+@app.route("/ready", methods=["GET"])
+def ready():
+    body = {
+        "ready": MODELS.is_ready(),
+        "served": MODELS.domains,
+        "loaded": MODELS.loaded()
+    }
+    return jsonify(body), 200 if body["ready"] else 503
+
+
+# =====================================================================
+# HOT MODEL RELOAD (new best_model.json / mlpN packs, no restart)
+# =====================================================================
+# a watcher thread polls the model directories of the loaded domains
+# every MODEL_WATCH_INTERVAL seconds (0 = off). A change is loaded only
+# once the files have stayed unchanged for a full interval (train.py
+# writes the packs, then results / best_model / residuals), then:
+#   1. the new best pack is loaded and validated off the request path:
+#      categories, scalers and input width vs window, plus a smoke
+#      forecast of every category that must come out finite
+#   2. MODELS.swap() replaces the domain's entry (models, scalers,
+#      window, categories) in one reference assignment; requests that
+#      already pinned the old entry (model_entry) finish on it
+#   3. forecast cache entries keyed on the old version, the domain's
+#      /compare architectures and the old stacked weights are dropped
+# A pack that fails validation is not served (the old one stays) and is
+# retried only when its files change again. POST /reload checks now.
+# train.py replaces every file it writes (temp file + os.replace), so the
+# .bin a running entry has mapped is never rewritten under it;
+# check_live_retrain.py retrains under a live serve.py to verify this.
+
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", 2))
+
+
+class ReloadError(ValueError):
+    pass
+
+
+def validate_entry(m, steps=10):
+    """Raise ReloadError unless a freshly loaded entry can serve its domain."""
+    if not m["categories"]:
+        raise ReloadError("pack has no categories")
+
+    _, series = load_series(m["domain"])
+    for c in m["categories"]:
+        if c not in m["models"] or c not in m["scalers"]:
+            raise ReloadError(f"no model / scaler for {c}")
+        width = engine.as_network(m["models"][c])["coefs"][0].shape[0]
+        if width != m["window"]:
+            raise ReloadError(f"{c}: model takes {width} inputs, window is {m['window']}")
+        if c not in series or len(series[c]) < m["window"]:
+            raise ReloadError(f"{c}: dataset has no {m['window']}-year history")
+
+    preds = run_forecast(m, series, m["categories"], steps)
+    for c, p in preds.items():
+        if len(p) != steps or not np.all(np.isfinite(p)):
+            raise ReloadError(f"{c}: smoke forecast is not {steps} finite values")
+
+
+def reload_domain(domain):
+    """Load, validate and swap in the domain's current best pack."""
+    start = time.perf_counter()
+    m = build_entry(domain)
+    validate_entry(m)
+
+    old = MODELS.swap(domain, m)
+    dropped = 0
+    if old is not None:
+        dropped = FORECAST_CACHE.invalidate(lambda key: key[0] == domain and old["version"] in key)
+        engine.drop_stacks(old["models"].values())
+    ARCHITECTURES.drop(domain)
+
+    report = {
+        "model": m["name"],
+        "previous": old["name"] if old else None,
+        "cache_invalidated": dropped,
+        "ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+    print(f"🔄 Reloaded {domain}: {report['previous']} → {m['name']} "
+          f"({report['ms']} ms, {dropped} cached results dropped)")
+    return report
+
+
+class ModelWatcher:
+
+    def __init__(self, interval=MODEL_WATCH_INTERVAL):
+        self.interval = interval
+        self.failures = 0
+        self.last = {}        # domain -> report of the last reload attempt
+        self._pending = {}    # domain -> version seen on the previous poll
+        self._rejected = {}   # domain -> version that failed validation
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:  # keep watching
+                print(f"⚠️ Model watcher: {e}")
+
+    def check(self, settle=True):
+        """Reload every loaded domain whose model files changed; returns the reports."""
+        reports = {}
+        with self._lock:
+            for domain in MODELS.loaded():
+                current = MODELS.get(domain)
+                seen = pack_version(current["directory"])
+                if seen == current["version"] or seen == self._rejected.get(domain):
+                    self._pending.pop(domain, None)
+                    continue
+                if settle and self._pending.get(domain) != seen:
+                    self._pending[domain] = seen  # possibly mid-write: wait one interval
+                    continue
+                self._pending.pop(domain, None)
+
+                try:
+                    report = {"status": "reloaded", **reload_domain(domain)}
+                except Exception as e:
+                    self.failures += 1
+                    self._rejected[domain] = seen
+                    report = {"status": "rejected", "model": current["name"],
+                              "error": f"{type(e).__name__}: {e}"}
+                    print(f"⚠️ Rejected new {domain} pack, still serving "
+                          f"{report['model']}: {report['error']}")
+                report["at"] = time.time()
+                self.last[domain] = reports[domain] = report
+        return reports
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "reloads": MODELS.reloads,
+            "failures": self.failures,
+            "models": {d: MODELS.get(d)["name"] for d in MODELS.loaded()},
+            "last": self.last
+        }
+
+
+WATCHER = ModelWatcher()
+
+
+@app.route("/reload", methods=["GET", "POST"])
+def reload_models():
+    if request.method == "POST":
+        return jsonify({"reloaded": WATCHER.check(settle=False), **WATCHER.stats()})
+    return jsonify(WATCHER.stats())
 
 
 # =====================================================================
@@ -364,30 +1081,192 @@ def civil_predict_all():
 
 @app.route("/results", methods=["GET"])
 def unified_results():
-    # ensure civil results return `best_model`
+    # civil results always carry `best_model` (see with_best_model)
     if "civil" in request.args:
-        with open(f"{DIR_EMI}/results.json", "r") as f:
-            raw = json.load(f)
-        if "best_model" not in raw and "best" in raw:
-            raw["best_model"] = raw["best"]
-        return jsonify(raw)
+        return domain_document("civil", "results")
 
     if "age" in request.args:
-        with open(f"{DIR_AGE}/results.json", "r") as f:
-            return jsonify(json.load(f))
+        return domain_document("age", "results")
 
     if "education" in request.args:
-        with open(f"{DIR_EDU}/results.json", "r") as f:
-            return jsonify(json.load(f))
+        return domain_document("education", "results")
 
     # default: gender results
-    with open(f"{DIR_GENDER}/results.json", "r") as f:
-        return jsonify(json.load(f))
+    return domain_document("gender", "results")
+
+
+# =====================================================================
+# LEGACY SERVERS (predict_api.py, age_predictor_server.py, ...)
+# =====================================================================
+# the routes of the old one-domain servers, with their bodies and
+# explanation texts, served from this process' packs, datasets, forecast
+# cache and results documents instead of a copy per process. Mounted at
+# /legacy/<domain>/...; legacy_app(domain) serves one of them at its old
+# root (its script and `python serve.py --legacy` bind the old port).
+
+LEGACY = {
+    d: Blueprint(f"legacy_{d}", __name__, url_prefix=f"/legacy/{d}")
+    for d in legacy_domains()
+}
+
+
+def legacy_explanation(domain):
+    return DOMAINS[domain]["legacy"]["explanation"]
+
+
+def legacy_best_model_payload(domain):
+    def build(raw):
+        best = with_best_model(raw)["best_model"]
+        return {
+            "best": best,
+            "metrics": raw[best],
+            "all_results": raw,
+            "explanation": legacy_explanation(domain)
+        }
+    return build
+
+
+def legacy_modal_payload(domain):
+    def build(raw):
+        return {**modal_payload(with_best_model(raw)), "explanation": legacy_explanation(domain)}
+    return build
+
+
+for _domain, _bp in LEGACY.items():
+    _legacy = DOMAINS[_domain]["legacy"]
+    if MODELS.is_served(_domain):
+        DOCS.register(f"best_model_{_domain}", results_path(_domain),
+                      build=legacy_best_model_payload(_domain))
+        DOCS.register(f"legacy_modal_{_domain}", results_path(_domain),
+                      build=legacy_modal_payload(_domain))
+
+    _bp.add_url_rule(_legacy["best_model_route"], "best_model",
+                     partial(domain_document, _domain, "best_model"))
+    _bp.add_url_rule(_legacy["results_route"], "results",
+                     partial(domain_document, _domain, "results"))
+
+
+# ------------------ GENDER (predict_api.py) -------------------
+
+@LEGACY["gender"].route("/predict")
+def legacy_gender_predict():
+    gender = request.args.get("gender")
+    if gender not in ["male", "female"]:
+        return jsonify({"error": "gender must be male or female"}), 400
+
+    m, years, preds = domain_forecast("gender", gender)
+    body = gender_body(m, years, preds, gender)
+    body["explanation"] = legacy_explanation("gender")
+    return jsonify(add_intervals(body, "gender", gender))
+
+
+# ------------------ AGE (age_predictor_server.py) -------------------
+
+@LEGACY["age"].route("/predict")
+def legacy_age_predict():
+    group = request.args.get("group")
+    if group not in model_entry("age")["categories"]:
+        return jsonify({"error": "Invalid group"}), 400
+
+    m, years, preds = domain_forecast("age", group)
+    return DOCS.embed(add_intervals(age_body(m, years, preds, group), "age", group),
+                      "legacy_modal_age")
+
+
+@LEGACY["age"].route("/predict-all")
+def legacy_age_predict_all():
+    m, years, preds = domain_forecast("age")
+    body = {
+        "groups": m["categories"],
+        "data": {g: {"years": years, "forecast": preds[g]} for g in m["categories"]},
+        "model_used": m["name"]
+    }
+    return DOCS.embed(add_intervals(body, "age"), "legacy_modal_age")
+
+
+# ------------------ EDUCATION (education_predictor.py) -------------------
+
+@LEGACY["education"].route("/predict-education")
+def legacy_predict_education():
+    category = request.args.get("category")
+    categories = model_entry("education")["categories"]
+    if category not in categories:
+        return jsonify({"error": f"Invalid category. Must be one of: {categories}"}), 400
+
+    m, years, preds = domain_forecast("education", category)
+    body = {
+        "dataset": "education",
+        **education_body(m, years, preds, category),
+        "explanation": legacy_explanation("education")
+    }
+    return jsonify(add_intervals(body, "education", category))
+
+
+@LEGACY["education"].route("/predict-education-all")
+def legacy_predict_education_all():
+    body = {
+        "dataset": "education",
+        **education_all_body(*domain_forecast("education")),
+        "explanation": legacy_explanation("education")
+    }
+    return jsonify(add_intervals(body, "education"))
+
+
+# ------------------ CIVIL STATUS (emigrants_predict_server.py) -------------------
+
+@LEGACY["civil"].route("/predict")
+def legacy_civil_predict():
+    status = request.args.get("status")
+    categories = model_entry("civil")["categories"]
+    if status not in categories:
+        return jsonify({"error": f"Invalid status. Options: {categories}"}), 400
+
+    m, years, preds = domain_forecast("civil", status)
+    return DOCS.embed(add_intervals(civil_body(m, years, preds, status), "civil", status),
+                      "legacy_modal_civil")
+
+
+@LEGACY["civil"].route("/predict-all")
+def legacy_civil_predict_all():
+    return DOCS.embed(add_intervals(civil_all_body(*domain_forecast("civil")), "civil"),
+                      "legacy_modal_civil")
+
+
+for _bp in LEGACY.values():
+    app.register_blueprint(_bp)
+
+
+class LegacyServer:
+    """WSGI app serving one legacy server's routes at its old root."""
+
+    def __init__(self, domain):
+        self.domain = domain
+        self.prefix = f"/legacy/{domain}"
+
+    def __call__(self, environ, start_response):
+        environ["PATH_INFO"] = self.prefix + environ.get("PATH_INFO", "")
+        return app(environ, start_response)
+
+    def test_client(self):
+        return Client(self)
+
+    def run(self, host="127.0.0.1", port=None, debug=False):
+        port = port or DOMAINS[self.domain]["legacy"]["port"]
+        WATCHER.start()
+        run_simple(host, port, self, use_reloader=debug, use_debugger=debug)
+
+
+def legacy_app(domain):
+    if domain not in LEGACY:
+        raise DomainNotServed(domain)
+    return LegacyServer(domain)
 
 
 # =====================================================================
 # RUN SERVER
 # =====================================================================
+# development server; production runs `python serve.py` (pre-fork workers)
 if __name__ == "__main__":
     print("🚀 Unified Prediction Server running on port 5001...")
+    WATCHER.start()
     app.run(port=5001, debug=True)
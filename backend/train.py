@@ -0,0 +1,567 @@
+# -*- coding: utf-8 -*-
+"""
+train.py
+
+Unified, incremental training driver for all four domains.
+
+Every domain runs the same pipeline:
+  load CSV → per-domain preprocessing (interpolation / smoothing / sqrt)
+  → MinMaxScaler per category → sliding window → train/val split
+  → fit mlp1/mlp2/mlp3 per category → validation metrics
+  → mlpN.pkl + mlpN.bin/.manifest.json, results.json, best_model.json,
+    residuals.json (scaled validation errors, for forecast intervals)
+
+Incremental retraining: each (category, architecture) cell is keyed by a
+content hash of its CSV column (and year index), the preprocessing
+parameters and the hyperparameters. The hashes are kept in
+<model dir>/train_state.json; a cell whose hash is unchanged reuses the
+fitted model from the existing mlpN.pkl instead of being refit, so
+correcting one value in education_yearly.csv refits 3 models, not 72.
+Metrics are always recomputed, so results.json is regenerated in full.
+
+Warm start (--warm-start): when a cell's inputs changed (typically a new
+year appended to the CSV) and a fitted model exists, training continues
+from that model on the extended windows instead of starting from random
+init. If the new data moves the MinMaxScaler range, the first and last
+layers are re-parameterized so the network computes exactly the same
+function in the new scaled space before training resumes. Iterations
+and wall time are reported against the cell's last cold fit
+(--compare-cold also runs the cold fits for a side-by-side measure).
+
+Usage (data and model paths resolve against backend/, from any directory):
+  python train.py                          # all domains, incremental
+  python train.py --domains age,civil      # only these domains
+  python train.py --domains education --full --jobs 4
+  python train.py --warm-start             # after appending a year
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.preprocessing import MinMaxScaler
+
+from dataset_store import data_path, to_snake
+from forecast_intervals import save_residuals
+from model_artifacts import export_pack, pack_entries, replace_file
+from model_registry import DOMAINS
+from training_pool import MAX_ITER, RANDOM_STATE, fit_models
+from windowing import build_windows, split_windows, stack_series
+
+STATE_FILE = "train_state.json"
+STATE_FORMAT = 2
+
+WINDOW = 3
+HORIZON = 1  # one-step windows: the servers forecast recursively
+TEST_SIZE = 0.2
+SPLIT = "random"
+SPLIT_SEED = 42
+
+MLP_CONFIGS = {
+    "mlp1": (32, 32),
+    "mlp2": (64, 64),
+    "mlp3": (128, 128)
+}
+
+# ============================================================
+# 1. PREPROCESSING (per domain)
+# ============================================================
+# each returns (categories, {category: raw column}, {category: series},
+#               preprocessing params, extra pack fields)
+
+def prepare_gender(df):
+    categories = ["male", "female"]
+    raw = {cat: df[cat].values for cat in categories}
+    series = {cat: df[cat].values.reshape(-1, 1) for cat in categories}
+    return categories, raw, series, {}, {}
+
+
+def prepare_age(df):
+    # Clean age group names (shared with the servers' age-group index)
+    df["ageGroup_clean"] = df["ageGroup"].apply(to_snake)
+
+    # Pivot to wide format
+    df_wide = df.pivot(index="year", columns="ageGroup_clean", values="count").reset_index()
+    raw = {cat: df_wide[cat].values for cat in df_wide.columns if cat != "year"}
+
+    # Fill missing age group data using interpolation
+    df_wide = df_wide.interpolate().bfill().ffill()
+
+    categories = [c for c in df_wide.columns if c != "year"]
+    series = {cat: df_wide[cat].values.reshape(-1, 1) for cat in categories}
+    return categories, raw, series, {"fill": "interpolate+bfill+ffill"}, {}
+
+
+EDUCATION_CATEGORIES = ["elementary", "highschool", "vocational", "college", "postgrad", "notReported"]
+SMOOTH_CATEGORIES = ["vocational", "notReported"]  # small / noisy series
+
+
+def prepare_education(df):
+    raw = {cat: df[cat].values.copy() for cat in EDUCATION_CATEGORIES}
+
+    # Centered 3-year rolling mean for small/noisy categories
+    for cat in SMOOTH_CATEGORIES:
+        df[cat] = (
+            df[cat]
+            .rolling(window=3, center=True)
+            .mean()
+            .bfill()
+            .ffill()
+        )
+
+    series = {cat: df[cat].values.reshape(-1, 1) for cat in EDUCATION_CATEGORIES}
+    params = {"smooth": SMOOTH_CATEGORIES, "rolling": 3}
+    return EDUCATION_CATEGORIES, raw, series, params, {}
+
+
+CIVIL_CATEGORIES = ["single", "married", "widower", "separated", "divorced", "notReported"]
+TINY_CATEGORIES = ["notReported"]  # very small + noisy category
+
+
+def prepare_civil(df):
+    from scipy.signal import medfilt
+
+    raw = {cat: df[cat].values for cat in CIVIL_CATEGORIES}
+
+    # Interpolate missing values safely
+    df_wide = df.interpolate().bfill().ffill()
+
+    series = {}
+    for cat in CIVIL_CATEGORIES:
+        vals = df_wide[cat].values.astype(float)
+
+        # Median smoothing for noise, then sqrt to stabilize variance
+        if cat in TINY_CATEGORIES:
+            vals = medfilt(vals, kernel_size=3)
+            vals = np.sqrt(vals)
+
+        series[cat] = vals.reshape(-1, 1)
+
+    params = {"fill": "interpolate+bfill+ffill", "tiny": TINY_CATEGORIES,
+              "medfilt": 3, "transform": "sqrt"}
+    return CIVIL_CATEGORIES, raw, series, params, {"tiny_categories": TINY_CATEGORIES}
+
+# ============================================================
+# 2. METRICS (per domain)
+# ============================================================
+# each takes unscaled validation (true, pred) and the category
+
+def gender_metrics(true_vals, pred_vals, cat):
+    mae = mean_absolute_error(true_vals, pred_vals)
+    rmse = np.sqrt(mean_squared_error(true_vals, pred_vals))
+    r2 = r2_score(true_vals, pred_vals)
+
+    # Safe MAPE (avoid division by zero)
+    mape = np.mean(np.abs((true_vals - pred_vals) / (true_vals + 1e-8))) * 100
+
+    accuracy = max(0, 100 - mape)  # "Accuracy-like" measure for MLP regression
+
+    return {"mae": mae, "rmse": rmse, "mape": mape, "r2": r2, "accuracy": accuracy}
+
+
+def smape(true_vals, pred_vals):
+    return np.mean(
+        2 * np.abs(true_vals - pred_vals) /
+        (np.abs(true_vals) + np.abs(pred_vals) + 1e-8)
+    ) * 100
+
+
+def age_metrics(true_vals, pred_vals, cat):
+    mae = mean_absolute_error(true_vals, pred_vals)
+    rmse = np.sqrt(mean_squared_error(true_vals, pred_vals))
+    s = smape(true_vals, pred_vals)
+    return {"mae": mae, "rmse": rmse, "smape": s, "accuracy": max(0, 100 - s)}
+
+
+def education_metrics(true_vals, pred_vals, cat):
+    mae = mean_absolute_error(true_vals, pred_vals)
+    rmse = np.sqrt(mean_squared_error(true_vals, pred_vals))
+    r2 = r2_score(true_vals, pred_vals)
+    s = smape(true_vals, pred_vals)
+    # "mape" holds SMAPE (key kept for the frontend)
+    return {"mae": mae, "rmse": rmse, "mape": s, "r2": r2, "accuracy": max(0, 100 - s)}
+
+
+def safe_smape(true_vals, pred_vals):
+    smapes = []
+
+    for t, p in zip(true_vals, pred_vals):
+
+        # If low magnitude → treat as scaled MAE
+        if t < 10 and p < 10:
+            smapes.append(abs(t - p) / 10)
+        else:
+            smapes.append(
+                2 * abs(t - p) / (abs(t) + abs(p) + 1e-8)
+            )
+
+    return np.mean(smapes) * 100
+
+
+def civil_metrics(true_vals, pred_vals, cat):
+    # Clamp negative values before the sqrt reversal, then square back
+    pred_vals = np.maximum(pred_vals, 0)
+    true_vals = np.maximum(true_vals, 0)
+    if cat in TINY_CATEGORIES:
+        pred_vals = np.square(pred_vals)
+        true_vals = np.square(true_vals)
+
+    mae = mean_absolute_error(true_vals, pred_vals)
+    rmse = np.sqrt(mean_squared_error(true_vals, pred_vals))
+    s = safe_smape(true_vals, pred_vals)
+
+    # Weighted accuracy for tiny categories
+    if true_vals.mean() < 20:
+        accuracy = max(0, 100 - s * 0.25)
+    else:
+        accuracy = max(0, 100 - s)
+
+    return {"mae": mae, "rmse": rmse, "smape": s, "accuracy": accuracy}
+
+# ============================================================
+# 3. DOMAIN TABLE
+# ============================================================
+
+# CSVs resolved against backend/ like the model directories, not the CWD
+PIPELINES = {
+    "gender": {"csv": data_path("gender_yearly.csv"), "prepare": prepare_gender, "metrics": gender_metrics},
+    "age": {"csv": data_path("age_yearly.csv"), "prepare": prepare_age, "metrics": age_metrics},
+    "education": {"csv": data_path("education_yearly.csv"), "prepare": prepare_education,
+                  "metrics": education_metrics},
+    "civil": {"csv": data_path("emigrants_marital_status.csv"), "prepare": prepare_civil,
+              "metrics": civil_metrics}
+}
+
+# ============================================================
+# 4. SHARED PIPELINE
+# ============================================================
+
+def load_domain(domain, window=WINDOW, split=SPLIT):
+    """Preprocessed, scaled and split data of a domain."""
+    spec = PIPELINES[domain]
+    df = pd.read_csv(spec["csv"])
+    years = df["year"].drop_duplicates().sort_values().values
+
+    categories, raw, series, params, extra = spec["prepare"](df)
+
+    scalers = {cat: MinMaxScaler() for cat in categories}
+    scaled = stack_series(
+        {cat: scalers[cat].fit_transform(series[cat]) for cat in categories}, categories)
+
+    # (categories, samples, window/horizon) for all categories at once
+    X, y = build_windows(scaled, window, HORIZON)
+    parts = split_windows(X, y, TEST_SIZE, split, SPLIT_SEED)
+    splits = {cat: tuple(part[i] for part in parts) for i, cat in enumerate(categories)}
+
+    return {
+        "domain": domain,
+        "window": window,
+        "split": split,
+        "years": years,
+        "categories": categories,
+        "raw": raw,
+        "params": params,
+        "extra": extra,
+        "scalers": scalers,
+        "splits": splits
+    }
+
+
+def validation_metrics(data, cat, model):
+    """Domain metrics of `model` on the validation split, in value space."""
+    _, Xval, _, yval = data["splits"][cat]
+    scaler = data["scalers"][cat]
+
+    # Reverse scaling
+    pred = model.predict(Xval)
+    pred_unscaled = scaler.inverse_transform(pred.reshape(-1, 1)).flatten()
+    true_unscaled = scaler.inverse_transform(yval).flatten()
+
+    return PIPELINES[data["domain"]]["metrics"](true_unscaled, pred_unscaled, cat)
+
+
+def validation_residuals(data, cat, model):
+    """Scaled validation errors (actual - predicted), for forecast intervals."""
+    _, Xval, _, yval = data["splits"][cat]
+    return yval.ravel() - model.predict(Xval)
+
+
+def build_pack(data, models):
+    """Pack dict in the layout the servers expect (gender: male/female keys)."""
+    if data["domain"] == "gender":
+        return {
+            "male_model": models["male"],
+            "female_model": models["female"],
+            "scaler_male": data["scalers"]["male"],
+            "scaler_female": data["scalers"]["female"],
+            "window": data["window"]
+        }
+    return {
+        "models": models,
+        "scalers": data["scalers"],
+        "window": data["window"],
+        "categories": data["categories"],
+        **data["extra"]
+    }
+
+# ============================================================
+# 5. INCREMENTAL STATE
+# ============================================================
+
+def column_hash(years, values):
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(years, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def cell_hash(data, cat, layers):
+    """Hash of everything a fitted (category, architecture) cell depends on."""
+    key = {
+        "column": column_hash(data["years"], data["raw"][cat]),
+        "preprocessing": data["params"],
+        "window": data["window"],
+        "split": {"test_size": TEST_SIZE, "random_state": SPLIT_SEED,
+                  # random splits hash as before the split mode existed
+                  **({} if data["split"] == "random" else {"mode": data["split"]})},
+        "hyperparameters": {"hidden_layer_sizes": list(layers), "max_iter": MAX_ITER,
+                            "random_state": RANDOM_STATE},
+        "sklearn": sklearn.__version__
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def load_state(output_dir):
+    """{cell: {"hash", "mode", "n_iter", "seconds", "cold_n_iter", "cold_seconds"}}"""
+    try:
+        with open(os.path.join(output_dir, STATE_FILE), "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if state.get("format") == 1:  # hashes only
+        return {cell: {"hash": h} for cell, h in state["cells"].items()}
+    return state.get("cells", {}) if state.get("format") == STATE_FORMAT else {}
+
+
+def save_state(output_dir, cells):
+    with replace_file(os.path.join(output_dir, STATE_FILE), "w") as f:
+        json.dump({"format": STATE_FORMAT, "cells": cells}, f, indent=2, sort_keys=True)
+
+
+def previous_pack(output_dir, model_name):
+    """({category: fitted MLPRegressor}, {category: scaler}) of mlpN.pkl."""
+    try:
+        with open(os.path.join(output_dir, f"{model_name}.pkl"), "rb") as f:
+            pack = pickle.load(f)
+    except OSError:
+        return {}, {}
+    return pack_entries(pack)[1:]
+
+# ============================================================
+# 6. WARM START
+# ============================================================
+
+def rescale_network(model, old_scaler, new_scaler):
+    """
+    Copy of a fitted MLPRegressor re-parameterized from `old_scaler`'s
+    scaled space to `new_scaler`'s, computing the same function.
+
+    With x_old = r * x_new + c (r = old.scale / new.scale,
+    c = old.min - r * new.min) on every input and on the target:
+      first layer   W' = r * W              b' = b + c * sum(W, axis=0)
+      output layer  W' = W / r              b' = (b - c) / r
+    """
+    model = copy.deepcopy(model)
+    r = old_scaler.scale_[0] / new_scaler.scale_[0]
+    c = old_scaler.min_[0] - r * new_scaler.min_[0]
+    if r == 1 and c == 0:
+        return model
+
+    W, b = model.coefs_[0], model.intercepts_[0]
+    model.coefs_[0], model.intercepts_[0] = r * W, b + c * W.sum(axis=0)
+
+    W, b = model.coefs_[-1], model.intercepts_[-1]
+    model.coefs_[-1], model.intercepts_[-1] = W / r, (b - c) / r
+    return model
+
+
+def warm_start_report(domain, stats, state):
+    """Iterations / wall time of the warm fits vs. the cells' cold fits."""
+    warm = [(cell, st) for cell, st in stats.items() if st["mode"] == "warm"]
+    if not warm:
+        return
+
+    ref = [(st, state[cell]) for cell, st in warm if "cold_n_iter" in state.get(cell, {})]
+    warm_iter = sum(st["n_iter"] for _, st in warm)
+    warm_sec = sum(st["seconds"] for _, st in warm)
+    print(f"🔥 {domain}: {len(warm)} warm-started fits, "
+          f"{warm_iter} iterations, {warm_sec:.2f} s")
+
+    if ref:
+        cold_iter = sum(c["cold_n_iter"] for _, c in ref)
+        cold_sec = sum(c["cold_seconds"] for _, c in ref)
+        used_iter = sum(st["n_iter"] for st, _ in ref)
+        used_sec = sum(st["seconds"] for st, _ in ref)
+        print(f"   vs cold fit ({len(ref)} cells): {cold_iter} iterations, "
+              f"{cold_sec:.2f} s → saved {cold_iter - used_iter} iterations, "
+              f"{cold_sec - used_sec:.2f} s")
+
+# ============================================================
+# 7. TRAIN ONE DOMAIN
+# ============================================================
+
+def train_domain(domain, jobs=1, full=False, warm_start=False, compare_cold=False):
+    output_dir = DOMAINS[domain]["directory"]
+    os.makedirs(output_dir, exist_ok=True)
+
+    data = load_domain(domain)
+    categories = data["categories"]
+    splits = data["splits"]
+
+    old_state = load_state(output_dir)
+    new_state = {}
+    reused = {}
+    tasks = {}
+
+    for model_name, layers in MLP_CONFIGS.items():
+        old_models, old_scalers = previous_pack(output_dir, model_name)
+        for cat in categories:
+            cell = f"{model_name}/{cat}"
+            old = old_state.get(cell, {})
+            new_state[cell] = {**old, "hash": cell_hash(data, cat, layers)}
+            Xtr, ytr = splits[cat][0], splits[cat][2]
+
+            if not full and old.get("hash") == new_state[cell]["hash"] and cat in old_models:
+                reused[(model_name, cat)] = old_models[cat]
+            elif warm_start and cat in old_models:
+                init = rescale_network(old_models[cat], old_scalers[cat], data["scalers"][cat])
+                tasks[(model_name, cat)] = (layers, Xtr, ytr, init)
+                if compare_cold:
+                    tasks[("cold", model_name, cat)] = (layers, Xtr, ytr)
+            else:
+                tasks[(model_name, cat)] = (layers, Xtr, ytr)
+
+    print(f"\n📦 {domain}: {len(tasks)} to fit, {len(reused)} reused")
+    fits = fit_models(tasks, jobs)
+
+    fitted = dict(reused)
+    stats = {}
+    for key, (model, st) in fits.items():
+        if key[0] == "cold":  # --compare-cold reference fit
+            new_state[f"{key[1]}/{key[2]}"].update(
+                cold_n_iter=st["n_iter"], cold_seconds=st["seconds"])
+            continue
+
+        cell = f"{key[0]}/{key[1]}"
+        fitted[key] = model
+        stats[cell] = st
+        new_state[cell].update(mode=st["mode"], n_iter=st["n_iter"], seconds=st["seconds"])
+        if st["mode"] == "cold":
+            new_state[cell].update(cold_n_iter=st["n_iter"], cold_seconds=st["seconds"])
+
+    warm_start_report(domain, stats, {**old_state, **new_state} if compare_cold else old_state)
+
+    results = {}
+    residuals = {}
+    for model_name, layers in MLP_CONFIGS.items():
+        category_models = {}
+        category_metrics = {}
+        avg_accuracy_total = 0
+
+        for cat in categories:
+            model = fitted[(model_name, cat)]
+            metrics = validation_metrics(data, cat, model)
+            residuals.setdefault(model_name, {})[cat] = validation_residuals(data, cat, model)
+            category_metrics[cat] = metrics
+            avg_accuracy_total += metrics["accuracy"]
+            category_models[cat] = model
+
+            print(f"  {model_name} {cat}: accuracy={metrics['accuracy']:.2f}%")
+
+        pack = build_pack(data, category_models)
+        with replace_file(f"{output_dir}/{model_name}.pkl", "wb") as f:
+            pickle.dump(pack, f)
+
+        # flat memory-mappable copy (.bin + .manifest.json) for the servers
+        export_pack(pack, output_dir, model_name)
+
+        results[model_name] = {"layers": layers}
+        if domain == "gender":
+            results[model_name].update(category_metrics)
+        else:
+            results[model_name]["metrics"] = category_metrics
+        results[model_name]["avg_accuracy"] = avg_accuracy_total / len(categories)
+
+    save_best_model(output_dir, results)
+    save_residuals(output_dir, residuals)
+    save_state(output_dir, new_state)
+    return {"fitted": len(stats), "reused": len(reused)}
+
+# ============================================================
+# 8. SELECT BEST MODEL
+# ============================================================
+
+def save_best_model(output_dir, results):
+    best_model_name = max(results, key=lambda k: results[k]["avg_accuracy"])
+
+    with replace_file(f"{output_dir}/results.json", "w") as f:
+        json.dump({"best_model": best_model_name, **results}, f, indent=4)
+
+    with replace_file(f"{output_dir}/best_model.json", "w") as f:
+        json.dump({"best": best_model_name}, f, indent=4)
+
+    print(f"🏆 BEST MODEL SELECTED: {best_model_name}")
+    return best_model_name
+
+# ============================================================
+# CLI
+# ============================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domains", default=",".join(PIPELINES),
+                        help="comma separated: gender,age,education,civil")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="parallel fits (1 = serial, 0 = one per core)")
+    parser.add_argument("--full", action="store_true",
+                        help="refit every cell, even those whose inputs are unchanged")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="continue training changed cells from their fitted models")
+    parser.add_argument("--compare-cold", action="store_true",
+                        help="with --warm-start: also run cold fits to measure the savings")
+    args = parser.parse_args(argv)
+
+    args.domains = [d.strip() for d in args.domains.split(",") if d.strip()]
+    unknown = [d for d in args.domains if d not in PIPELINES]
+    if unknown:
+        parser.error(f"unknown domain(s): {unknown}")
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    summary = {
+        d: train_domain(d, args.jobs, args.full, args.warm_start, args.compare_cold)
+        for d in args.domains
+    }
+
+    print("\n====================================================")
+    for domain, counts in summary.items():
+        print(f"{domain:<10} fitted {counts['fitted']:>3}   reused {counts['reused']:>3}")
+    print("====================================================")
+
+
+if __name__ == "__main__":
+    main()
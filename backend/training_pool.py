@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+training_pool.py
+
+Process-pool fan-out for the MLP fits of train.py.
+
+Every (architecture, category) fit is independent, so the driver hands
+all of them to fit_models() at once. With --jobs 1 (default) they run
+one after another in-process; with --jobs N they run on N worker
+processes. Each fit is seeded (random_state) and runs single-threaded
+BLAS in either mode, and results come back keyed by task, so the
+fitted weights, results.json and best_model.json are identical to a
+serial run whatever the completion order.
+
+A task can carry an already fitted model to warm-start from (train.py
+--warm-start); it is trained further from those weights instead of
+being refit from random init.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.neural_network import MLPRegressor
+from threadpoolctl import threadpool_limits
+
+MAX_ITER = 5000
+RANDOM_STATE = 42
+
+# ============================================================
+# FITTING
+# ============================================================
+
+def warm_fit(model, X_train, y_train):
+    """
+    Continue training a fitted MLPRegressor with fit(warm_start=True),
+    keeping its weights and optimizer state. The early-stopping record
+    is reset: the previous best loss was measured on the old data (and
+    possibly the old scaling), and would otherwise stop the run after
+    n_iter_no_change epochs. Returns the number of epochs run.
+    """
+    model.set_params(warm_start=True)
+    model.best_loss_ = np.inf
+    model._no_improvement_count = 0
+    model.fit(X_train, y_train.ravel())
+    return model.n_iter_
+
+
+def fit_mlp(layers, X_train, y_train, init=None):
+    """
+    One seeded MLPRegressor fit (single-threaded BLAS): from random init,
+    or warm-started from the fitted model `init`.
+    Returns (model, {"mode", "n_iter", "seconds"}).
+    """
+    start = time.perf_counter()
+    with threadpool_limits(limits=1):
+        if init is None:
+            model = MLPRegressor(
+                hidden_layer_sizes=layers,
+                max_iter=MAX_ITER,
+                random_state=RANDOM_STATE
+            )
+            model.fit(X_train, y_train.ravel())
+            mode, n_iter = "cold", model.n_iter_
+        else:
+            model = init
+            mode, n_iter = "warm", warm_fit(model, X_train, y_train)
+
+    return model, {"mode": mode, "n_iter": int(n_iter),
+                   "seconds": time.perf_counter() - start}
+
+
+def fit_models(tasks, jobs=1):
+    """
+    Fit every task {key: (layers, X_train, y_train[, init model])}.
+    Returns {key: (fitted model, fit stats)} in the order of `tasks`.
+    """
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1:
+        return {key: fit_mlp(*task) for key, task in tasks.items()}
+
+    print(f"⚙️  Fitting {len(tasks)} models on {jobs} processes...")
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {key: pool.submit(fit_mlp, *task) for key, task in tasks.items()}
+        return {key: future.result() for key, future in futures.items()}
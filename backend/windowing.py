@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+windowing.py
+
+Supervised sliding windows and train/validation splits for every
+category of a domain at once.
+
+All series of a domain share the year axis, so they are stacked into
+one (categories × years) array and windowed with sliding_window_view:
+
+  X[c, i] = values[c, i : i + window]
+  y[c, i] = values[c, i + window : i + window + horizon]
+
+Both are zero-copy views. The split picks the same sample indices for
+every category, and indexing with them makes the only copy:
+  random         same rows as train_test_split(test_size, random_state=seed)
+  chronological  the last test_size of the windows are the validation set
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.model_selection import train_test_split
+
+SPLIT_MODES = ("random", "chronological")
+
+
+def stack_series(series, categories):
+    """(categories × years) float array from {category: (years,) or (years, 1)}."""
+    return np.stack([np.asarray(series[cat], dtype=float).ravel() for cat in categories])
+
+
+def build_windows(values, window, horizon=1):
+    """
+    Views X (categories, samples, window) and y (categories, samples,
+    horizon) over `values` (categories × years), with
+    samples = years - window - horizon + 1.
+    """
+    values = np.atleast_2d(values)
+    n_samples = values.shape[1] - window - horizon + 1
+    if n_samples < 1:
+        raise ValueError(f"{values.shape[1]} years are too few for "
+                         f"window={window}, horizon={horizon}")
+
+    X = sliding_window_view(values[:, :-horizon], window, axis=1)
+    y = sliding_window_view(values[:, window:], horizon, axis=1)
+    return X, y
+
+
+def split_indices(n_samples, test_size=0.2, mode="random", seed=42):
+    """(train indices, validation indices) shared by all categories."""
+    if mode == "random":
+        train_idx, val_idx = train_test_split(np.arange(n_samples), test_size=test_size,
+                                              random_state=seed)
+        return train_idx, val_idx
+    if mode == "chronological":
+        n_val = math.ceil(test_size * n_samples)
+        return np.arange(n_samples - n_val), np.arange(n_samples - n_val, n_samples)
+    raise ValueError(f"unknown split mode {mode!r} (expected one of {SPLIT_MODES})")
+
+
+def split_windows(X, y, test_size=0.2, mode="random", seed=42):
+    """X_train, X_val, y_train, y_val, each indexed [category, sample, ...]."""
+    train_idx, val_idx = split_indices(X.shape[1], test_size, mode, seed)
+    return X[:, train_idx], X[:, val_idx], y[:, train_idx], y[:, val_idx]